@@ -1,18 +1,43 @@
 
 from dotenv import load_dotenv # type: ignore
-load_dotenv() 
+load_dotenv()
 
-from fastapi import FastAPI, HTTPException   # type: ignore # noqa: E402
+from contextlib import asynccontextmanager  # noqa: E402
+from fastapi import FastAPI, HTTPException, Request   # type: ignore # noqa: E402
 from fastapi.middleware.cors import CORSMiddleware # type: ignore  # noqa: E402
+from fastapi.responses import ORJSONResponse, StreamingResponse # type: ignore  # noqa: E402
+import orjson # type: ignore  # noqa: E402
 from pydantic import BaseModel  # type: ignore # noqa: E402
 from src.agent import BuildIntelAgent  # noqa: E402
+from src.providers.cache_provider import close_default_cache  # noqa: E402
+from src.providers.http_client import close_client  # noqa: E402
 
 
-app = FastAPI(title="BuildIntel API", version="0.1.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Build the agent (and its Redis connection pool) once per process
+    agent = BuildIntelAgent()
+    await agent.setup()
+    app.state.agent = agent
+    yield
+    await agent.twitter.close()
+    await agent.github.close()
+    await agent.funding.close()
+    await agent.cache.close()
+    await close_default_cache()
+    await close_client()
+
+
+app = FastAPI(
+    title="BuildIntel API",
+    version="0.1.0",
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+)
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"], 
+    allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -22,15 +47,53 @@ class AnalyzeRequest(BaseModel):
     project_name: str
 
 @app.post("/analyze")
-async def analyze_project(request: AnalyzeRequest):
+async def analyze_project(request: AnalyzeRequest, http_request: Request):
     try:
-        agent = BuildIntelAgent()
-        await agent.setup()
+        agent: BuildIntelAgent = http_request.app.state.agent
         result = await agent.analyze_project(request.project_name)
-        data = result.get("RESULT", {}).get("content", result)
-        return {"status": "success", "data": data}
+        # analyze_project returns the result payload directly; an "error"
+        # key means the pipeline found nothing to analyze
+        if isinstance(result, dict) and result.get("error"):
+            raise HTTPException(status_code=404, detail=result["error"])
+        return {"status": "success", "data": result}
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/analyze/stream")
+async def analyze_project_stream(request: AnalyzeRequest, http_request: Request):
+    """Stream pipeline stages as Server-Sent Events instead of one big JSON.
+
+    DISCOVERY and AGGREGATION arrive as soon as they complete, so clients
+    see data well before the LLM insight finishes.
+    """
+    agent: BuildIntelAgent = http_request.app.state.agent
+
+    async def event_stream():
+        async for event_name, payload in agent.stream_analysis(request.project_name.strip()):
+            data = orjson.dumps(payload, default=str).decode()
+            yield f"event: {event_name}\ndata: {data}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
+
+
+if __name__ == "__main__":
+    import os
+    import uvicorn # type: ignore
+
+    # uvloop + httptools give a faster event loop / HTTP parser, and one
+    # worker per core uses the whole box. Each worker gets its own agent
+    # via the lifespan handler. Production equivalent:
+    #   gunicorn main:app -k uvicorn.workers.UvicornWorker \
+    #     --workers $(nproc) --worker-connections 1000 --keep-alive 5
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=int(os.getenv("PORT", "8000")),
+        loop="uvloop",
+        http="httptools",
+        workers=os.cpu_count(),
+    )
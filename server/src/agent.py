@@ -2,19 +2,15 @@ import logging
 import os
 import json
 import asyncio
-from ulid import ULID # type: ignore
+from datetime import datetime, timedelta, timezone
 from sentient_agent_framework import AbstractAgent, Session, Query, ResponseHandler # type: ignore
-from sentient_agent_framework.implementation.default_hook import DefaultHook # type: ignore
-from sentient_agent_framework.implementation.default_response_handler import DefaultResponseHandler # type: ignore
-from sentient_agent_framework.implementation.default_session import DefaultSession # type: ignore
-from sentient_agent_framework.interface.identity import Identity # type: ignore
 
 from src.providers.discovery.base_discovery import DiscoveryProvider
 from src.providers.github_provider import GitHubProvider
 from src.providers.twitter_provider import TwitterProvider
 from src.providers.funding_provider import FundingProvider
 from src.providers.llm_provider import LLMProvider
-from src.providers.cache_provider import CacheProvider
+from src.providers.cache_provider import CacheProvider, connect_default_cache
 
 # 🪵 Logging configuration
 logging.basicConfig(
@@ -34,15 +30,6 @@ def safe_json(obj):
         return str(obj)
 
 
-class MockSessionObject:
-    """Minimal mock to simulate SessionObject for offline analysis."""
-    def __init__(self):
-        self.processor_id = "local-processor"
-        self.activity_id = ULID()
-        self.request_id = ULID()
-        self.interactions = []
-
-
 class BuildIntelAgent(AbstractAgent):
     """
     BuildIntel Agent 🧱
@@ -68,6 +55,19 @@ class BuildIntelAgent(AbstractAgent):
         """Async setup for providers that need connections."""
 
         await self.cache.connect()
+        # GitHub keeps a cache of its own for repo payloads, adaptive-TTL
+        # entries and the stale copies — it needs its own connection
+        await self.github.init_cache()
+        # Funding results (24h) and the cached_json memos on its lookup
+        # helpers resolve to this cache — connect it or they stay in-process
+        await self.funding.init_cache()
+        # Backs cached_json on the discovery providers (they carry no
+        # CacheProvider of their own) — without this their memoized paid
+        # search calls never reach Redis
+        await connect_default_cache()
+        # Twitter keeps its own cache plus a background refresh worker and
+        # a server-side failure-accounting script — both live in initialize()
+        await self.twitter.initialize()
         logger.info("✅ BuildIntelAgent fully initialized and connected.")
 
     async def assist(
@@ -83,25 +83,52 @@ class BuildIntelAgent(AbstractAgent):
 
         await response_handler.emit_text_block("STATUS", f"🔍 Analyzing {project_name}...")
 
+        result = None
+        async for event_name, payload in self.stream_analysis(project_name):
+            await response_handler.emit_json(event_name, payload)
+            if event_name == "RESULT":
+                result = payload
+
+        if result is None:
+            await response_handler.emit_text_block("ERROR", "❌ Could not discover project URLs")
+            await response_handler.complete()
+            return
+
+        await response_handler.emit_text_block("STATUS", "✅ Analysis complete")
+        await response_handler.complete()
+
+        logger.info(f"✅ Analysis fully complete for {project_name}")
+
+    async def stream_analysis(self, project_name: str):
+        """Async generator yielding (event_name, payload) as pipeline stages finish.
+
+        Emits DISCOVERY and AGGREGATION as soon as they are available and
+        RESULT last; yields nothing further when discovery comes up empty.
+        Drives `assist`, the direct HTTP path, and the SSE streaming route.
+        """
+
         # 1️⃣ Try cache first
         cached_data = await self.cache.get(project_name)
         if cached_data:
             logger.info("⚡ Using cached result")
-            await response_handler.emit_json("CACHED_RESULT", cached_data)
-            await response_handler.complete()
+            yield ("RESULT", cached_data)
             return
 
-        # 2️⃣ Discovery
-        await response_handler.emit_text_block("STATUS", "🌐 Discovering project URLs...")
-        discovered = await self.discovery.discover_project(project_name)
-
-        if not discovered:
-            await response_handler.emit_text_block("ERROR", "❌ Could not discover project URLs")
-            await response_handler.complete()
-            return
+        # 2️⃣ Discovery (URLs are far more stable than stats, so they get
+        # their own cache entry with a longer TTL)
+        discovery_key = f"discovery:{project_name}"
+        discovered = await self.cache.get(discovery_key)
+        if discovered:
+            logger.info("⚡ Using cached discovery result")
+        else:
+            discovered = await self.discovery.discover_project(project_name)
+            if not discovered:
+                return
+            await self.cache.set(discovery_key, discovered, ttl=86400)
 
-        logger.info(f"discovered projects ${discovered}")
-        await response_handler.emit_json("DISCOVERY", discovered)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("discovered projects %r", discovered)
+        yield ("DISCOVERY", discovered)
 
         # Normalize discovery keys (support plural arrays and legacy singular keys)
         def _get_list(d, *keys):
@@ -116,8 +143,6 @@ class BuildIntelAgent(AbstractAgent):
         funding_urls = _get_list(discovered, "fundings", "funding")
 
         # 3️⃣ Aggregation (run only available tasks concurrently)
-        await response_handler.emit_text_block("STATUS", "📊 Aggregating project data...")
-
         tasks = []
         labels = []
 
@@ -165,18 +190,19 @@ class BuildIntelAgent(AbstractAgent):
         else:
             logger.info("ℹ️ No aggregation tasks to run (no discovered urls).")
 
-        await response_handler.emit_json("AGGREGATION", {
+        # Built once; reused for both the AGGREGATION event and the result
+        aggregation = {
           "github": github_stats,
           "twitter": twitter_stats,
           "funding": funding_info
-        })
+        }
+        yield ("AGGREGATION", aggregation)
 
         # 4️⃣ Compute composite activity metrics
         activity_metrics = self._compute_activity_metrics(github_stats, twitter_stats, funding_info)
 
 
         # 5️⃣ Generate Insight
-        await response_handler.emit_text_block("STATUS", "🧠 Generating insights...")
         try:
           insight = await self.llm.generate_insight(project_name, github_stats, twitter_stats, funding_info)
         except Exception as e:
@@ -187,11 +213,7 @@ class BuildIntelAgent(AbstractAgent):
         result = {
           "project": project_name,
           "discovery": discovered,
-          "aggregation": {
-            "github": github_stats,
-            "twitter": twitter_stats,
-            "funding": funding_info
-          },
+          "aggregation": aggregation,
           "activity_metrics": activity_metrics,
           "insight": insight
         }
@@ -199,12 +221,8 @@ class BuildIntelAgent(AbstractAgent):
         # 6️⃣ Cache results
         await self.cache.set(project_name, result, ttl=3600)
 
-        # 7️⃣ Return and complete
-        await response_handler.emit_json("RESULT", result)
-        await response_handler.emit_text_block("STATUS", "✅ Analysis complete")
-        await response_handler.complete()
-
-        logger.info(f"✅ Analysis fully complete for {project_name}")
+        # 7️⃣ Emit the structured result
+        yield ("RESULT", result)
 
     
     def _compute_activity_metrics(self, github_stats, twitter_stats, funding_info):
@@ -235,12 +253,16 @@ class BuildIntelAgent(AbstractAgent):
 
           recency_bonus = 0
           if last_commits:
-            # recent commits (last 30 days = +20 bonus)
-            from datetime import datetime, timezone
-            recent_count = sum(
-              1 for d in last_commits
-              if (datetime.now(timezone.utc) - datetime.fromisoformat(d)).days < 30
-            )
+            # recent commits (last 30 days = +20 bonus); one now() call,
+            # compared against a precomputed cutoff
+            cutoff = datetime.now(timezone.utc) - timedelta(days=30)
+            recent_count = 0
+            for d in last_commits:
+              try:
+                if datetime.fromisoformat(d) >= cutoff:
+                  recent_count += 1
+              except (TypeError, ValueError):
+                pass
             recency_bonus = min(20, recent_count * 2)
 
           github_score = min(
@@ -281,37 +303,12 @@ class BuildIntelAgent(AbstractAgent):
 
     
     async def analyze_project(self, project_name: str):
-      """Run the agent directly and capture its output."""
-
-      # 1️⃣ Setup a fake session
-      session_obj = MockSessionObject()
-      session = DefaultSession(session_obj)
-
-      # 2️⃣ Create a simple response queue
-      queue = asyncio.Queue()
-
-      # 3️⃣ Hook + Identity + ResponseHandler
-      hook = DefaultHook(queue)
-      identity = Identity(id=session.processor_id, name=self.name)
-      handler = DefaultResponseHandler(identity, hook)
-
-      # 4️⃣ Prepare a Query
-      query = Query(id=str(ULID()), prompt=project_name)
-
-      # 5️⃣ Run the assist logic
-      asyncio.create_task(self.assist(session, query, handler))
-
-      # 6️⃣ Collect events from queue
-      results = {}
-      while True:
-        event = await queue.get()
-        results[event.event_name] = (
-          event.model_dump() if hasattr(event, "model_dump") else str(event)
-        )
-        queue.task_done()
-
-        # The DoneEvent signals completion
-        if event.__class__.__name__ == "DoneEvent":
-          break
-
-      return json.loads(json.dumps(results, default=str))
+      """Run the analysis pipeline directly, bypassing the event machinery."""
+
+      result = None
+      async for event_name, payload in self.stream_analysis(project_name.strip()):
+        if event_name == "RESULT":
+          result = payload
+      if result is None:
+        return {"project": project_name, "error": "Could not discover project URLs"}
+      return result
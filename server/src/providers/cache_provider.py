@@ -1,15 +1,25 @@
 import time
 import logging
-import json
 import os
+import asyncio
+import hashlib
+import uuid
+import msgpack # type: ignore
+from collections import OrderedDict
+from functools import wraps
 from redis import asyncio as aioredis # type: ignore
 
 logger = logging.getLogger(__name__)
 
+L1_TTL = 60          # seconds a hot key stays valid in-process
+L1_MAX_ENTRIES = 1024
+INVALIDATE_CHANNEL = "cache:invalidate"
+
 class CacheProvider:
     """
     Redis-backed async cache provider with metadata sync.
-    Each cached entry includes _meta info:
+    Dict entries read back from Redis carry _meta info derived from the
+    live key TTL:
         {
             "_meta": {
                 "expires": <unix timestamp>,
@@ -18,14 +28,23 @@ class CacheProvider:
             ... actual cached data ...
         }
 
-    Falls back to in-memory cache if Redis is unavailable.
+    A small in-process L1 (LRU, short TTL) sits in front of Redis so
+    repeated hot-key reads skip the network round-trip; instances keep
+    each other honest via a Redis pub/sub invalidation channel.
+    Falls back to the L1 alone if Redis is unavailable.
     """
 
     def __init__(self, redis_url: str = os.getenv("REDIS_URL"), default_ttl: int = 3600):
-        self._cache = {}
+        self._cache = OrderedDict()
+        # Identifies this instance on the invalidation channel so it can
+        # ignore its own publishes — a write must not evict the L1 entry
+        # it just populated
+        self._instance_id = uuid.uuid4().hex[:12]
         self.default_ttl = default_ttl
         self.redis_url = redis_url
         self._redis = None
+        self._pubsub = None
+        self._invalidation_task = None
 
     # ─────────────────────────────
     # Initialization
@@ -33,64 +52,208 @@ class CacheProvider:
     async def connect(self):
         """Connect to Redis if available."""
         try:
-            self._redis = await aioredis.from_url(
-                self.redis_url, encoding="utf-8", decode_responses=True
-            )
+            # No decode_responses: msgpack unpacks the raw bytes directly,
+            # saving a UTF-8 decode per read.
+            self._redis = await aioredis.from_url(self.redis_url)
             logger.info("✅ Connected to Redis cache at %s", self.redis_url)
+            await self._start_invalidation_listener()
         except Exception as e:
             logger.warning("⚠️ Redis unavailable, using in-memory cache only: %s", e)
             self._redis = None
 
+    async def _start_invalidation_listener(self):
+        """Subscribe to the invalidation channel and evict L1 keys as they change."""
+        try:
+            self._pubsub = self._redis.pubsub()
+            await self._pubsub.subscribe(INVALIDATE_CHANNEL)
+            self._invalidation_task = asyncio.create_task(self._invalidation_loop())
+        except Exception as e:
+            logger.warning("⚠️ Could not start cache invalidation listener: %s", e)
+            self._pubsub = None
+
+    async def _invalidation_loop(self):
+        async for message in self._pubsub.listen():
+            if message.get("type") != "message":
+                continue
+            raw = message.get("data")
+            if isinstance(raw, bytes):
+                raw = raw.decode("utf-8", errors="ignore")
+            sender, sep, key = raw.partition("|")
+            if not sep:
+                key = sender  # untagged message from an older writer
+            elif sender == self._instance_id:
+                continue  # our own write — the L1 copy is already fresh
+            self._cache.pop(key, None)
+
+    def _invalidation_msg(self, key: str) -> str:
+        return f"{self._instance_id}|{key}"
+
+    async def _publish_invalidation(self, key: str):
+        if self._redis:
+            try:
+                await self._redis.publish(INVALIDATE_CHANNEL, self._invalidation_msg(key))
+            except Exception as e:
+                logger.debug("Invalidation publish failed for %s: %s", key, e)
+
+    # ─────────────────────────────
+    # L1 helpers
+    # ─────────────────────────────
+    def _l1_get(self, key: str):
+        entry = self._cache.get(key)
+        if not entry:
+            return None
+        if time.time() > entry["expires"]:
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry["value"]
+
+    def _l1_set(self, key: str, value, ttl: float):
+        # With Redis connected the L1 is only a short-lived front and its
+        # entries are capped; without Redis it is the store, so the
+        # caller's full TTL must be honored or every entry would silently
+        # expire after L1_TTL seconds.
+        if self._redis is not None:
+            ttl = min(ttl, L1_TTL)
+        self._cache[key] = {"value": value, "expires": time.time() + ttl}
+        self._cache.move_to_end(key)
+        while len(self._cache) > L1_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+
     # ─────────────────────────────
     # Get / Set
     # ─────────────────────────────
     async def get(self, key: str):
-        """Get cached value (tries Redis first, then in-memory)."""
+        """Get cached value (L1 first, then Redis)."""
+        value = self._l1_get(key)
+        if value is not None:
+            return value
+
         # Try Redis
         if self._redis:
             try:
-                value = await self._redis.get(key)
+                # One round-trip for value + TTL instead of two
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    pipe.get(key)
+                    pipe.ttl(key)
+                    value, ttl = await pipe.execute()
                 if value:
-                    data = json.loads(value)
-                    # Sync TTL metadata if Redis supports TTL
-                    ttl = await self._redis.ttl(key)
-                    if ttl and "_meta" in data:
-                        data["_meta"]["ttl"] = ttl
-                        data["_meta"]["expires"] = time.time() + ttl
+                    data = msgpack.unpackb(value, raw=False)
+                    # Derive expiry metadata from the authoritative Redis TTL
+                    if isinstance(data, dict) and ttl and ttl > 0:
+                        data["_meta"] = {"expires": time.time() + ttl, "ttl": ttl}
+                    self._l1_set(key, data, ttl if ttl and ttl > 0 else self.default_ttl)
                     return data
             except Exception as e:
                 logger.warning("Redis get failed (%s), falling back to memory.", e)
 
-        # Fallback to in-memory
-        entry = self._cache.get(key)
-        if not entry:
-            return None
-        if time.time() > entry["expires"]:
-            del self._cache[key]
-            return None
-        return entry["value"]
+        return None
+
+    async def mget(self, keys: list):
+        """Fetch many keys in one round-trip; returns `{key: value or None}`.
+
+        Same semantics as `get` per key — L1 is consulted first, Redis
+        misses come back on a single pipeline (value + TTL pairs so
+        `_meta` stays accurate) instead of one network turn each.
+        """
+        results = {key: self._l1_get(key) for key in keys}
+        missing = [key for key, value in results.items() if value is None]
+
+        if self._redis and missing:
+            try:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for key in missing:
+                        pipe.get(key)
+                        pipe.ttl(key)
+                    replies = await pipe.execute()
+                for key, (value, ttl) in zip(missing, zip(replies[::2], replies[1::2])):
+                    if not value:
+                        continue
+                    data = msgpack.unpackb(value, raw=False)
+                    if isinstance(data, dict) and ttl and ttl > 0:
+                        data["_meta"] = {"expires": time.time() + ttl, "ttl": ttl}
+                    self._l1_set(key, data, ttl if ttl and ttl > 0 else self.default_ttl)
+                    results[key] = data
+            except Exception as e:
+                logger.warning("Redis mget failed (%s), falling back to memory.", e)
+
+        return results
 
     async def set(self, key: str, value, ttl: int = None):
-        """Set a cached value with metadata."""
+        """Set a cached value; expiry lives in Redis' own TTL.
+
+        The caller's dict is stored as-is — no `_meta` injection — so
+        writers never see their payload mutated and serialized entries
+        stay smaller. `get` reattaches `_meta` from the live TTL.
+        """
         ttl = ttl or self.default_ttl
-        expires_at = time.time() + ttl
 
-        # Attach metadata to the stored object
-        if isinstance(value, dict):
-            value["_meta"] = {"expires": expires_at, "ttl": ttl}
-        else:
-            value = {"value": value, "_meta": {"expires": expires_at, "ttl": ttl}}
+        if not isinstance(value, dict):
+            value = {"value": value}
+
+        self._l1_set(key, value, ttl)
 
         # Try Redis
         if self._redis:
             try:
-                await self._redis.setex(key, ttl, json.dumps(value))
+                await self._redis.setex(key, ttl, msgpack.packb(value, use_bin_type=True, default=str))
+                await self._publish_invalidation(key)
                 return
             except Exception as e:
                 logger.warning("Redis set failed (%s), falling back to memory.", e)
 
-        # Fallback to in-memory cache
-        self._cache[key] = {"value": value, "expires": expires_at}
+    async def mset_with_ttl(self, mapping: dict, delete=()):
+        """Store many `key -> (value, ttl)` pairs in one Redis round-trip.
+
+        Same semantics as `set` per entry, but the writes (and their
+        invalidation publishes) ride a single pipeline instead of one
+        network turn each. Keys in `delete` are dropped on the same
+        pipeline, so a write-plus-evict pair costs one round-trip too.
+        """
+        prepared = {}
+        for key, (value, ttl) in mapping.items():
+            ttl = ttl or self.default_ttl
+            if not isinstance(value, dict):
+                value = {"value": value}
+            prepared[key] = (value, ttl)
+            self._l1_set(key, value, ttl)
+
+        for key in delete:
+            self._cache.pop(key, None)
+
+        if self._redis and (prepared or delete):
+            try:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for key, (value, ttl) in prepared.items():
+                        pipe.setex(key, ttl, msgpack.packb(value, use_bin_type=True, default=str))
+                        pipe.publish(INVALIDATE_CHANNEL, self._invalidation_msg(key))
+                    for key in delete:
+                        pipe.delete(key)
+                        pipe.publish(INVALIDATE_CHANNEL, self._invalidation_msg(key))
+                    await pipe.execute()
+            except Exception as e:
+                logger.warning("Redis mset failed (%s), falling back to memory.", e)
+
+    # ─────────────────────────────
+    # Raw Redis access (counter-style keys, no msgpack/L1)
+    # ─────────────────────────────
+    def register_script(self, script: str):
+        """Register a server-side Lua script; returns None when Redis is down."""
+        if self._redis:
+            try:
+                return self._redis.register_script(script)
+            except Exception as e:
+                logger.warning("Redis script registration failed (%s).", e)
+        return None
+
+    async def hmget(self, key: str, *fields):
+        """Raw hash read for counter-style keys that bypass the msgpack codec."""
+        if self._redis:
+            try:
+                return await self._redis.hmget(key, *fields)
+            except Exception as e:
+                logger.warning("Redis hmget failed (%s).", e)
+        return [None] * len(fields)
 
     # ─────────────────────────────
     # Maintenance
@@ -100,11 +263,70 @@ class CacheProvider:
         if self._redis:
             try:
                 await self._redis.delete(key)
+                await self._publish_invalidation(key)
             except Exception as e:
                 logger.warning("Redis delete failed (%s).", e)
         self._cache.pop(key, None)
 
     async def close(self):
         """Gracefully close Redis connection."""
+        if self._invalidation_task:
+            self._invalidation_task.cancel()
+        if self._pubsub:
+            try:
+                await self._pubsub.close()
+            except Exception:
+                pass
         if self._redis:
             await self._redis.close()
+
+
+# Shared store for cached_json when the wrapped object has no .cache of
+# its own (falls back to the in-process L1 until/unless connected).
+_default_cache = CacheProvider()
+
+
+async def connect_default_cache():
+    """Connect the shared cached_json store to Redis (call once at startup).
+
+    Without this, memoized search calls on objects lacking a `.cache`
+    (the discovery providers) only ever hit the in-process L1.
+    """
+    await _default_cache.connect()
+
+
+async def close_default_cache():
+    """Release the shared cached_json store's Redis connection."""
+    await _default_cache.close()
+
+
+def cached_json(prefix: str, ttl: int = 3600):
+    """Memoize an async method's serializable result under the cache layer.
+
+    Keys are `{prefix}:{sha1(call args)}`, so identical paid search queries
+    within the TTL are served from cache instead of re-hitting the provider.
+    Uses `self.cache` when the instance has one, else a module-level store.
+    """
+    def decorator(func):
+        @wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            store = getattr(self, "cache", None) or _default_cache
+            digest = hashlib.sha1(
+                repr((args, sorted(kwargs.items()))).encode()
+            ).hexdigest()
+            key = f"{prefix}:{digest}"
+
+            hit = await store.get(key)
+            if hit is not None:
+                if isinstance(hit, dict):
+                    hit = {k: v for k, v in hit.items() if k != "_meta"}
+                    if set(hit) == {"value"}:
+                        return hit["value"]
+                return hit
+
+            result = await func(self, *args, **kwargs)
+            if result is not None:
+                await store.set(key, result, ttl=ttl)
+            return result
+        return wrapper
+    return decorator
@@ -37,22 +37,13 @@ class DiscoveryProvider:
         websites = website_data.get("websites", [])
         others = website_data.get("others", [])
 
-        # Deduplicate globally
-        def unique(seq):
-            seen = set()
-            out = []
-            for x in seq:
-                if x not in seen:
-                    seen.add(x)
-                    out.append(x)
-            return out
-
+        # Deduplicate globally (dict.fromkeys preserves order in C)
         result = {
-            "websites": unique(websites),
-            "githubs": unique(githubs),
-            "fundings": unique(fundings),
-            "twitters": unique(twitters),
-            "others": unique(others),
+            "websites": list(dict.fromkeys(websites)),
+            "githubs": list(dict.fromkeys(githubs)),
+            "fundings": list(dict.fromkeys(fundings)),
+            "twitters": list(dict.fromkeys(twitters)),
+            "others": list(dict.fromkeys(others)),
         }
 
         result = refine_discovery(result)
@@ -4,12 +4,36 @@ import httpx # type: ignore
 import base64
 import re
 import asyncio
+import yaml # type: ignore
 from typing import List
 
+try:
+    from yaml import CSafeLoader as _YamlLoader # type: ignore
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader as _YamlLoader # type: ignore
+
+from src.providers.http_client import fast_json, get_client
+
 logger = logging.getLogger(__name__)
 
 TAVILY_SEARCH_URL = os.getenv("TAVILY_BASE_URL", "https://api.tavily.com/search")
-GITHUB_API = os.getenv("GITHUB_API_URL", "https://api.github.com") 
+GITHUB_API = os.getenv("GITHUB_API_URL", "https://api.github.com")
+
+# Bound fan-out across concurrent /analyze requests so bursts don't
+# trip GitHub/Tavily rate limits or starve the event loop.
+_GH_SEM = asyncio.Semaphore(5)
+_TAVILY_SEM = asyncio.Semaphore(3)
+
+# Compiled once; the FUNDING.yml fan-out runs these on every repo.
+_URL_RE = re.compile(r"https?://[^\s]+")
+_SPONSOR_RE = re.compile(r"(?m)^(github|open_collective|patreon|ko_fi|buy_me_a_coffee):\s*(.+)$")
+_PLATFORM_URL = {
+    "github": "https://github.com/sponsors/{}",
+    "open_collective": "https://opencollective.com/{}",
+    "patreon": "https://patreon.com/{}",
+    "ko_fi": "https://ko-fi.com/{}",
+    "buy_me_a_coffee": "https://buymeacoffee.com/{}",
+}
 
 
 class FundingDiscovery:
@@ -43,35 +67,45 @@ class FundingDiscovery:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                r = await client.get(url, headers=headers)
-                if r.status_code == 404:
-                    return []
-                r.raise_for_status()
-                data = r.json()
-                content = base64.b64decode(data.get("content", "")).decode("utf-8", errors="ignore")
-
-                # Extract sponsor URLs
-                urls = re.findall(r"(https?://[^\s]+)", content)
-
-                # Map known sponsor handles to URLs
-                for match in re.finditer(
-                    r"(?m)^(github|open_collective|patreon|ko_fi|buy_me_a_coffee):\s*(.+)$", content
-                ):
+            client = get_client()
+            async with _GH_SEM:
+                r = await client.get(url, headers=headers, timeout=10)
+            if r.status_code == 404:
+                return []
+            r.raise_for_status()
+            data = fast_json(r)
+            content = base64.b64decode(data.get("content", "")).decode("utf-8", errors="ignore")
+
+            urls = []
+
+            # Proper YAML parse (C loader) — handles list values, quoting
+            # and comments that the regex scrape missed
+            try:
+                parsed = yaml.load(content, Loader=_YamlLoader)
+            except yaml.YAMLError:
+                parsed = None
+
+            if isinstance(parsed, dict):
+                for platform, value in parsed.items():
+                    handles = value if isinstance(value, list) else [value]
+                    for handle in handles:
+                        if not handle:
+                            continue
+                        handle = str(handle).strip()
+                        if handle.startswith("http"):
+                            urls.append(handle)
+                        elif platform in _PLATFORM_URL:
+                            urls.append(_PLATFORM_URL[platform].format(handle))
+            else:
+                # Fallback: regex scrape of the raw text
+                urls.extend(u.strip() for u in _URL_RE.findall(content))
+                for match in _SPONSOR_RE.finditer(content):
                     platform, handle = match.groups()
-                    handle = handle.strip()
-                    if platform == "github":
-                        urls.append(f"https://github.com/sponsors/{handle}")
-                    elif platform == "open_collective":
-                        urls.append(f"https://opencollective.com/{handle}")
-                    elif platform == "patreon":
-                        urls.append(f"https://patreon.com/{handle}")
-                    elif platform == "ko_fi":
-                        urls.append(f"https://ko-fi.com/{handle}")
-                    elif platform == "buy_me_a_coffee":
-                        urls.append(f"https://buymeacoffee.com/{handle}")
-
-                return [u.strip() for u in urls if u.startswith("http")]
+                    urls.append(_PLATFORM_URL[platform].format(handle.strip()))
+
+            # Order-preserving dedupe: these URLs end up in LLM prompts, so
+            # the ordering must be stable across processes for prompt reuse
+            return [u for u in dict.fromkeys(urls) if u.startswith("http")]
         except Exception as e:
             logger.error(f"FundingDiscovery GitHub funding error for {repo_full_name}: {e}")
             return []
@@ -88,10 +122,11 @@ class FundingDiscovery:
         payload = {"api_key": self.tavily_key, "query": q, "num_results": 15}
 
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.post(TAVILY_SEARCH_URL, json=payload)
-                resp.raise_for_status()
-                data = resp.json()
+            client = get_client()
+            async with _TAVILY_SEM:
+                resp = await client.post(TAVILY_SEARCH_URL, json=payload, timeout=15.0)
+            resp.raise_for_status()
+            data = fast_json(resp)
 
             urls = []
             for r in data.get("results", []):
@@ -119,19 +154,22 @@ class FundingDiscovery:
         """
         logger.info(f"🔎 Starting FundingDiscovery for '{project_name}'")
 
-        tavily_task = asyncio.create_task(self._tavily_funding_search(project_name, limit=limit))
-        github_funding_tasks = []
-
+        github_funding_coros = []
         if github_repos:
             for repo_url in github_repos[:3]:  # limit to top 3 repos for rate safety
                 if "github.com" in repo_url:
                     full_name = repo_url.replace("https://github.com/", "").strip("/")
-                    github_funding_tasks.append(
-                        asyncio.create_task(self._fetch_github_funding(full_name))
-                    )
+                    github_funding_coros.append(self._fetch_github_funding(full_name))
 
-        github_results = await asyncio.gather(*github_funding_tasks, return_exceptions=True)
-        tavily_urls = await tavily_task
+        # One gather so the Tavily search and FUNDING.yml fetches overlap fully
+        tavily_urls, *github_results = await asyncio.gather(
+            self._tavily_funding_search(project_name, limit=limit),
+            *github_funding_coros,
+            return_exceptions=True,
+        )
+        if not isinstance(tavily_urls, list):
+            logger.error("FundingDiscovery Tavily task failed: %s", tavily_urls)
+            tavily_urls = []
 
         # Flatten and merge
         github_urls = []
@@ -139,7 +177,7 @@ class FundingDiscovery:
             if isinstance(g, list):
                 github_urls.extend(g)
 
-        all_urls = list({*tavily_urls, *github_urls})[:limit]
+        all_urls = list(dict.fromkeys([*tavily_urls, *github_urls]))[:limit]
 
         logger.info("💰 FundingDiscovery complete for %s → %d total URLs", project_name, len(all_urls))
         return all_urls
\ No newline at end of file
@@ -1,8 +1,9 @@
 import os
-import httpx # type: ignore
 import logging
 from typing import List
 
+from src.providers.http_client import fast_json, get_client
+
 logger = logging.getLogger(__name__)
 
 GITHUB_API = os.getenv("GITHUB_API_URL", "https://api.github.com") 
@@ -24,28 +25,29 @@ class GitHubDiscovery:
         q = f"{project_name} in:name"  # tighter search
         params = {"q": q, "sort": "stars", "order": "desc", "per_page": str(limit * 2)}
 
-        async with httpx.AsyncClient(timeout=20) as client:
-            r = await client.get(f"{GITHUB_API}/search/repositories", headers=self.headers, params=params)
-            r.raise_for_status()
-            results = r.json().get("items", [])
+        client = get_client()
+        r = await client.get(
+            f"{GITHUB_API}/search/repositories", headers=self.headers, params=params, timeout=20
+        )
+        r.raise_for_status()
+        results = fast_json(r).get("items", [])
 
         clean_urls = []
         project_lower = project_name.lower()
 
         for repo in results:
-          _full_name = repo["full_name"].lower()
           owner = repo["owner"]["login"].lower()
           name = repo["name"].lower()
-          topics = [t.lower() for t in repo.get("topics", [])]
-          description = (repo.get("description") or "").lower()
 
+          # Cheapest checks first; topics as a set for O(1) membership,
+          # and the description substring scan only as a last resort
           if (
               owner == project_lower
-              or project_lower in owner
               or name == project_lower
               or name.startswith(project_lower)
-              or project_lower in topics
-              or project_lower in description
+              or project_lower in owner
+              or project_lower in {t.lower() for t in repo.get("topics") or ()}
+              or project_lower in (repo.get("description") or "").lower()
           ):
               clean_urls.append(repo["html_url"])
 
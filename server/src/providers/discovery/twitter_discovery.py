@@ -1,16 +1,40 @@
 
 import os
+import asyncio
+import heapq
 import logging
 import httpx # type: ignore
+from functools import lru_cache, partial
 from typing import List
 from urllib.parse import urlparse
 
+from src.providers.cache_provider import cached_json
+from src.providers.http_client import fast_json, get_client
+
 logger = logging.getLogger(__name__)
 
 SERPAPI_URL = os.getenv("SERP_BASE_URL", "https://serpapi.com/search.json")
 TAVILY_SEARCH_URL = os.getenv("TAVILY_BASE_URL", "https://api.tavily.com/search")
 
+# Liveness probes are off by default: x.com/twitter.com routinely answer
+# 400/403 to unauthenticated requests, so the round-trips bought no signal
+# and the code fell back to the unvalidated list anyway.
+_VALIDATE_HEAD = os.getenv("TWITTER_VALIDATE_HEAD", "false").lower() in ("1", "true", "yes")
+
+# Cap parallel liveness probes so validation doesn't hammer hosts
+_HEAD_SEM = asyncio.Semaphore(8)
+
+# Bound backend fan-out so a batch of concurrent discover() calls doesn't
+# open hundreds of simultaneous requests and trip provider rate limits
+_SERP_SEM = asyncio.Semaphore(int(os.getenv("SERP_CONCURRENCY", "4")))
+_TAVILY_SEM = asyncio.Semaphore(8)
 
+# Canonical hosts — status codes aren't a reliable existence signal here,
+# so probing them is skipped even when validation is enabled.
+_CANONICAL_HOSTS = frozenset({"x.com", "twitter.com"})
+
+
+@lru_cache(maxsize=512)
 def _normalize_twitter_url(u: str) -> str | None:
     """Normalize various twitter/x URL shapes to canonical https://twitter.com/<handle> or https://x.com/<handle>"""
     if not u:
@@ -35,15 +59,16 @@ def _normalize_twitter_url(u: str) -> str | None:
         return f"https://twitter.com/{u}"
     return None
 
-def _score_twitter_url(project_name: str, url: str) -> int:
-    """Score likely relevance of a Twitter/X URL"""
+@lru_cache(maxsize=1024)
+def _score_twitter_url(project_lower: str, url: str) -> int:
+    """Score likely relevance of a Twitter/X URL (expects a lowered name)"""
     u = url.lower()
     score = 0
-    if f"/{project_name.lower()}" in u:
+    if f"/{project_lower}" in u:
         score += 10
     if "official" in u:
         score += 5
-    if u.endswith(f"/{project_name.lower()}"):
+    if u.endswith(f"/{project_lower}"):
         score += 10
     if any(k in u for k in ("support", "team", "labs", "protocol")):
         score += 3
@@ -52,7 +77,12 @@ def _score_twitter_url(project_name: str, url: str) -> int:
 
 async def _head_ok(client: httpx.AsyncClient, url: str) -> bool:
     try:
-        r = await client.head(url, follow_redirects=True, timeout=6.0)
+        async with _HEAD_SEM:
+            # Zero-byte ranged GET: HEAD is frequently rejected outright,
+            # while a Range request costs the same round-trip with a body cap
+            r = await client.get(
+                url, headers={"Range": "bytes=0-0"}, follow_redirects=True, timeout=6.0
+            )
         return r.status_code < 400
     except Exception:
         return False
@@ -73,6 +103,7 @@ class TwitterDiscovery:
         self.serp_key = os.getenv("SERPAPI_KEY")
         self.tavily_key = os.getenv("TAVILY_API_KEY")
 
+    @cached_json("serp:twitter", ttl=3600)
     async def _serpapi_twitter_search(self, project_name: str, limit: int = 6) -> List[str]:
         if not self.serp_key:
             return []
@@ -84,10 +115,10 @@ class TwitterDiscovery:
         }
 
         try:
-            async with httpx.AsyncClient(timeout=12.0) as client:
-                resp = await client.get(SERPAPI_URL, params=params)
-                resp.raise_for_status()
-                data = resp.json()
+            async with _SERP_SEM:
+                resp = await get_client().get(SERPAPI_URL, params=params, timeout=12.0)
+            resp.raise_for_status()
+            data = fast_json(resp)
         except Exception as e:
             logger.debug("SerpAPI twitter search failed: %s", e)
             return []
@@ -124,6 +155,7 @@ class TwitterDiscovery:
       
         return urls[:limit]
 
+    @cached_json("serp:google-site", ttl=3600)
     async def _serpapi_google_site_search(self, project_name: str, limit: int = 6) -> List[str]:
         """Use SerpAPI's google engine to search site:twitter.com for the project"""
         if not self.serp_key:
@@ -131,10 +163,10 @@ class TwitterDiscovery:
         q = f'{project_name} site:x.com "official" OR "official account"'
         params = {"engine": "google", "q": q, "api_key": self.serp_key, "num": limit}
         try:
-            async with httpx.AsyncClient(timeout=12.0) as client:
-                resp = await client.get(SERPAPI_URL, params=params)
-                resp.raise_for_status()
-                data = resp.json()
+            async with _SERP_SEM:
+                resp = await get_client().get(SERPAPI_URL, params=params, timeout=12.0)
+            resp.raise_for_status()
+            data = fast_json(resp)
         except Exception as e:
             logger.debug("SerpAPI google site search failed: %s", e)
             return []
@@ -149,6 +181,7 @@ class TwitterDiscovery:
                 break
         return urls[:limit]
 
+    @cached_json("tavily:twitter", ttl=3600)
     async def _tavily_search_for_twitter(self, project_name: str, limit: int = 8) -> List[str]:
         if not self.tavily_key:
             return []
@@ -158,10 +191,10 @@ class TwitterDiscovery:
             "num_results": 12,
         }
         try:
-            async with httpx.AsyncClient(timeout=12.0) as client:
-                resp = await client.post(TAVILY_SEARCH_URL, json=payload)
-                resp.raise_for_status()
-                data = resp.json()
+            async with _TAVILY_SEM:
+                resp = await get_client().post(TAVILY_SEARCH_URL, json=payload, timeout=12.0)
+            resp.raise_for_status()
+            data = fast_json(resp)
         except Exception as e:
             logger.debug("Tavily twitter search failed: %s", e)
             return []
@@ -181,58 +214,46 @@ class TwitterDiscovery:
         logger.info("TwitterDiscovery: searching for %s", project_name)
         candidates: List[str] = []
 
-        # SerpAPI twitter engine (best structured if available)
-        if self.serp_key:
-            try:
-                serp_urls = await self._serpapi_twitter_search(project_name, limit=limit)
-                logger.info("TwitterDiscovery: SerpAPI twitter found %d", len(serp_urls))
-                candidates.extend(serp_urls)
-            except Exception as e:
-                logger.debug("TwitterDiscovery SerpAPI twitter step failed: %s", e)
-
-        # Tavily fallback to find twitter links
-        if len(candidates) < limit and self.tavily_key:
-            try:
-                tavily_urls = await self._tavily_search_for_twitter(project_name, limit=limit)
-                logger.info("TwitterDiscovery: Tavily found %d", len(tavily_urls))
-                for u in tavily_urls:
-                    if u not in candidates:
-                        candidates.append(u)
-            except Exception as e:
-                logger.debug("TwitterDiscovery Tavily step failed: %s", e)
-
-        # SerpAPI google site:twitter search as extra fallback (if serp key present)
-        if len(candidates) < limit and self.serp_key:
-            try:
-                google_urls = await self._serpapi_google_site_search(project_name, limit=limit)
-                logger.info("TwitterDiscovery: SerpAPI google-site found %d", len(google_urls))
-                for u in google_urls:
-                    if u not in candidates:
-                        candidates.append(u)
-            except Exception as e:
-                logger.debug("TwitterDiscovery SerpAPI google step failed: %s", e)
-
-        # Normalize/dedupe
-        unique = []
-        for u in candidates:
-            if not u:
+        # All three backends are independent external calls (each returns []
+        # when its key is missing) — run them together and merge in priority
+        # order: SerpAPI twitter > Tavily > SerpAPI google-site.
+        backend_results = await asyncio.gather(
+            self._serpapi_twitter_search(project_name, limit=limit),
+            self._tavily_search_for_twitter(project_name, limit=limit),
+            self._serpapi_google_site_search(project_name, limit=limit),
+            return_exceptions=True,
+        )
+        backend_labels = ("SerpAPI twitter", "Tavily", "SerpAPI google-site")
+
+        for label, urls in zip(backend_labels, backend_results):
+            if not isinstance(urls, list):
+                logger.debug("TwitterDiscovery %s step failed: %s", label, urls)
                 continue
-            norm = _normalize_twitter_url(u)
-            if norm and norm not in unique:
-                unique.append(norm)
-
-        # Validate candidates with HEAD checks (cheap)
-        validated = []
-        async with httpx.AsyncClient(timeout=8.0) as client:
-            for u in unique:
-                ok = await _head_ok(client, u)
-                if ok:
-                    validated.append(u)
-                else:
-                    logger.debug("TwitterDiscovery: HEAD check failed for %s", u)
-
-        final = validated or unique  
+            logger.info("TwitterDiscovery: %s found %d", label, len(urls))
+            candidates.extend(urls)
+
+        # Backends already return normalized URLs — one order-preserving
+        # dedupe is all that's left
+        unique = list(dict.fromkeys(candidates))
+
+        # Optional liveness validation (default off — see _VALIDATE_HEAD).
+        # Canonical x.com/twitter.com URLs pass through unprobed either way.
+        final = unique
+        if _VALIDATE_HEAD:
+            to_probe = [
+                u for u in unique if urlparse(u).netloc.lower() not in _CANONICAL_HOSTS
+            ]
+            if to_probe:
+                client = get_client()
+                checks = await asyncio.gather(
+                    *(_head_ok(client, u) for u in to_probe), return_exceptions=True
+                )
+                dead = {u for u, ok in zip(to_probe, checks) if ok is not True}
+                for u in dead:
+                    logger.debug("TwitterDiscovery: liveness check failed for %s", u)
+                final = [u for u in unique if u not in dead] or unique
         logger.info("TwitterDiscovery: returning %d profile(s) for %s", len(final[:limit]), project_name)
 
-        scored = sorted(final, key=lambda u: _score_twitter_url(project_name, u), reverse=True)
-        return scored[:limit]
+        # Top-limit selection is O(N log limit) vs O(N log N) for a full sort
+        project_lower = project_name.lower()
+        return heapq.nlargest(limit, final, key=partial(_score_twitter_url, project_lower))
@@ -1,8 +1,18 @@
 """utils for the discovery providers."""
 
-from urllib.parse import urlparse
 import re
 
+# Compiled once; refine_discovery runs this in per-URL loops
+_X_HANDLE_RE = re.compile(r"x\.com/([A-Za-z0-9_-]+)")
+
+# Domain labels that must never become trusted tokens
+_TLD_STOPWORDS = frozenset({
+    "co", "com", "org", "io", "app", "ai", "net", "xyz",
+    "dev", "tech", "studio", "systems", "space", "network",
+    "cloud", "tools", "so", "sh", "gg", "build",
+    "eth", "crypto", "nft", "dao", "chain", "sol", "bnb", "www",
+})
+
 
 def refine_discovery(results: dict) -> dict:
     """
@@ -11,11 +21,13 @@ def refine_discovery(results: dict) -> dict:
     that do not correlate with discovered GitHub orgs, domains, or handles.
     """
     def clean_domain(url: str) -> str:
+        # Manual split beats urlparse here: no ParseResult allocation or
+        # scheme regex just to pull the netloc out of an http(s) URL
         try:
-            d = urlparse(url).netloc.lower()
-            d = re.sub(r"^www\.", "", d)
-            d = d.split(":")[0]
-            return d
+            d = url.split("://", 1)[1].split("/", 1)[0].lower()
+            if d.startswith("www."):
+                d = d[4:]
+            return d.split(":", 1)[0]
         except Exception:
             return ""
 
@@ -26,13 +38,11 @@ def refine_discovery(results: dict) -> dict:
     for site in results.get("websites", []) + results.get("others", []):
         dom = clean_domain(site)
         if dom:
-            for part in dom.split("."):
-                if len(part) > 2 and part not in (
-                    ".co", ".com", ".org", ".io", ".app", ".ai", ".net", ".xyz",
-                      ".dev", ".tech", ".studio", ".systems", ".space", ".network",
-                      ".cloud", ".tools", ".so", ".sh", ".gg", ".build",
-                      ".eth", ".crypto", ".nft", ".dao", ".chain", ".sol", ".bnb"
-                    ):
+            # Skip the final label (the actual TLD) and any stopword label —
+            # the old dotted-string tuple never matched split() output, so
+            # every TLD leaked into the token set
+            for part in dom.split(".")[:-1]:
+                if len(part) > 2 and part not in _TLD_STOPWORDS:
                     trusted_tokens.add(part)
 
     # From GitHub orgs
@@ -45,7 +55,7 @@ def refine_discovery(results: dict) -> dict:
 
     # From Twitter handles
     for tw in results.get("twitters", []):
-        match = re.search(r"x\.com/([A-Za-z0-9_-]+)", tw)
+        match = _X_HANDLE_RE.search(tw)
         if match:
             handle = match.group(1).lower()
             if len(handle) > 2:
@@ -60,24 +70,29 @@ def refine_discovery(results: dict) -> dict:
             extended_tokens.add(token.replace("labs", "").replace("protocol", "").strip("-_"))
     trusted_tokens = extended_tokens
 
-    # 2️⃣ Define helper to filter any list by token overlap
+    # 2️⃣ One compiled alternation (longest-first so prefixes don't shadow)
+    # pushes the token matching into C instead of a Python loop per URL
+    if not trusted_tokens:
+        return results
+
+    token_re = re.compile(
+        "|".join(re.escape(t) for t in sorted(trusted_tokens, key=len, reverse=True))
+    )
+
     def filter_urls(urls: list[str]) -> list[str]:
-        refined = []
+        # Dedupe inline (order-preserving) so no second pass is needed
+        seen = set()
+        out = []
         for u in urls:
-            low = u.lower()
-            if any(tok in low for tok in trusted_tokens):
-                refined.append(u)
-        return refined
+            if u not in seen and token_re.search(u.lower()):
+                seen.add(u)
+                out.append(u)
+        return out
 
-    # 3️⃣ Apply refinement to all key lists
+    # 3️⃣ Apply refinement (filter + dedupe in one pass) to all key lists
     results["twitters"] = filter_urls(results.get("twitters", []))
     results["fundings"] = filter_urls(results.get("fundings", []))
     results["websites"] = filter_urls(results.get("websites", []))
     results["others"] = filter_urls(results.get("others", []))
 
-    # 4️⃣ Deduplicate again (to be safe)
-    for key in results.keys():
-        if isinstance(results[key], list):
-            results[key] = list(dict.fromkeys(results[key]))  # preserves order
-
     return results
@@ -1,24 +1,50 @@
 import os
+import asyncio
 import logging
-import httpx # type: ignore
 import re
+import heapq
+from functools import lru_cache
+from operator import itemgetter
 from typing import List, Dict
-from urllib.parse import urlparse
+
+from src.providers.http_client import fast_json, get_client
 
 logger = logging.getLogger(__name__)
 TAVILY_SEARCH_URL = os.getenv("TAVILY_BASE_URL", "https://api.tavily.com/search")
 
-# Crypto/web project–common TLDs
-PREFERRED_TLDS = [
+# Bound Tavily fan-out under batch discovery workloads
+_TAVILY_SEM = asyncio.Semaphore(8)
+
+# Crypto/web project–common TLDs (tuple: str.endswith checks it in C)
+PREFERRED_TLDS = (
     ".co", ".com", ".org", ".io", ".app", ".ai", ".net", ".xyz",
     ".dev", ".tech", ".studio", ".systems", ".space", ".network",
     ".cloud", ".tools", ".so", ".sh", ".gg", ".build",
     ".eth", ".crypto", ".nft", ".dao", ".chain", ".sol", ".bnb"
-]
-DISALLOWED_DOMAINS = [
+)
+DISALLOWED_DOMAINS = (
     "bulbapedia", "pokemon", "tradingview", "deloitte", "linkedin", "medium",
     "wikipedia", "youtube", "reddit", "facebook", "bloomberg", "forbes"
-]
+)
+
+
+@lru_cache(maxsize=256)
+def _subdomain_re(project_lower: str) -> re.Pattern:
+    """Compiled (app|docs|portal).<project> pattern, cached per project."""
+    return re.compile(rf"(app|docs|portal)\.{re.escape(project_lower)}")
+
+
+@lru_cache(maxsize=512)
+def _domain_of(url: str) -> str:
+    """Lowercased netloc without a leading www., cached per URL."""
+    # Manual split — urlparse allocates a ParseResult per call just to
+    # hand back the netloc
+    try:
+        domain = url.split("://", 1)[1].split("/", 1)[0].lower()
+        domain = domain[4:] if domain.startswith("www.") else domain
+        return domain.split(":", 1)[0]
+    except Exception:
+        return ""
 
 class WebsiteDiscovery:
     """Find and rank official websites and docs for a project."""
@@ -27,25 +53,20 @@ class WebsiteDiscovery:
         self.tavily_key = tavily_key or os.getenv("TAVILY_API_KEY")
 
     def _extract_domain(self, url: str) -> str:
-        try:
-            domain = urlparse(url).netloc.lower()
-            # remove www.
-            return domain[4:] if domain.startswith("www.") else domain
-        except Exception:
-            return ""
-
-    def _score_url(self, project_name: str, url: str) -> int:
-        """Assign a relevance score to each URL."""
+        return _domain_of(url)
+
+    def _score_url(self, project_lower: str, url: str) -> int:
+        """Assign a relevance score to each URL (expects a lowered name)."""
         low = url.lower()
         domain = self._extract_domain(url)
         score = 0
 
         # Direct domain match boost (e.g. zora.co)
-        if project_name.lower() in domain:
+        if project_lower in domain:
             score += 10
 
         # Preferred TLD boost
-        if any(domain.endswith(tld) for tld in PREFERRED_TLDS):
+        if domain.endswith(PREFERRED_TLDS):
             score += 3
 
         # Penalize bad/irrelevant sources
@@ -53,7 +74,7 @@ class WebsiteDiscovery:
             score -= 20
 
         # Boost URLs containing "app", "docs", "www", etc. (subdomains of same org)
-        if re.search(rf"(app|docs|portal)\.{project_name.lower()}", domain):
+        if _subdomain_re(project_lower).search(domain):
             score += 5
 
         # Title hints
@@ -64,6 +85,7 @@ class WebsiteDiscovery:
 
     async def discover(self, project_name: str, limit: int = 6) -> Dict[str, List[str]]:
         results = {"websites": [], "others": []}
+        project_lower = project_name.lower()
         if not self.tavily_key:
             logger.warning("WebsiteDiscovery: TAVILY_API_KEY not configured; skipping discovery")
             return results
@@ -75,44 +97,45 @@ class WebsiteDiscovery:
         payload = {"api_key": self.tavily_key, "query": q, "num_results": 25}
 
         try:
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                resp = await client.post(TAVILY_SEARCH_URL, json=payload)
-                resp.raise_for_status()
-                data = resp.json()
+            client = get_client()
+            async with _TAVILY_SEM:
+                resp = await client.post(TAVILY_SEARCH_URL, json=payload, timeout=15.0)
+            resp.raise_for_status()
+            data = fast_json(resp)
 
             raw_urls = [r.get("url") for r in data.get("results", []) if r.get("url")]
             scored = []
             for u in raw_urls:
                 if not u or not u.startswith("http"):
                     continue
-                s = self._score_url(project_name, u)
+                s = self._score_url(project_lower, u)
                 scored.append((u, s))
 
-            # Sort by score (descending) + dedup
-            scored.sort(key=lambda x: x[1], reverse=True)
+            # Top-10 by score (heap beats a full sort) + dedup by domain
             seen = set()
             ranked = []
-            for u, s in scored:
+            for u, s in heapq.nlargest(10, scored, key=itemgetter(1)):
                 domain = self._extract_domain(u)
                 if domain not in seen:
                     seen.add(domain)
                     ranked.append(u)
 
-            # Optional HEAD validation
-            validated = []
-            async with httpx.AsyncClient(timeout=6.0) as client:
-                for u in ranked[:10]:
-                    try:
-                        r = await client.head(u, follow_redirects=True)
-                        if r.status_code < 400:
-                            validated.append(u)
-                    except Exception:
-                        continue
+            # Optional HEAD validation (fanned out)
+            async def _head_ok(u):
+                try:
+                    r = await client.head(u, follow_redirects=True, timeout=6.0)
+                    return r.status_code < 400
+                except Exception:
+                    return False
+
+            to_check = ranked
+            checks = await asyncio.gather(*(_head_ok(u) for u in to_check))
+            validated = [u for u, ok in zip(to_check, checks) if ok]
 
             # Classify top results
             for u in validated[:limit]:
                 domain = self._extract_domain(u)
-                if project_name.lower() in domain:
+                if project_lower in domain:
                     results["websites"].append(u)
                 else:
                     results["others"].append(u)
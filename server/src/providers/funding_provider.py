@@ -1,10 +1,17 @@
 import logging
-import json
+import time
+import asyncio
 import httpx # type: ignore
 import os
 from typing import Any, Dict, Optional
 
-from src.providers.cache_provider import CacheProvider
+try:
+    import ijson # type: ignore
+except ImportError:  # streaming parse is optional; fall back to one-shot
+    ijson = None
+
+from src.providers.cache_provider import CacheProvider, cached_json
+from src.providers.http_client import fast_json, get_client
 from src.providers.llm_provider import LLMProvider
 
 logger = logging.getLogger(__name__)
@@ -12,6 +19,16 @@ logger = logging.getLogger(__name__)
 DEFILLAMA_URL = os.getenv("DEFILLAMA_API_URL", "https://api.llama.fi")
 COINGECKO_URL = os.getenv("COINGECKO_API_URL", "https://api.coingecko.com/api/v3")
 
+# In-process indexed view of the ~3k-entry DeFiLlama protocol list so each
+# lookup is a dict hit instead of a substring scan over re-parsed JSON.
+# CacheProvider still persists the raw list as a warm-restart source.
+_PROTOCOLS_INDEX_TTL = 86400
+
+# Bound concurrent detail fetches to api.llama.fi under batch lookups
+_LLAMA_SEM = asyncio.Semaphore(8)
+_protocols_lock = asyncio.Lock()
+_protocols_index = None  # (built_at, by_name, by_slug, protocols)
+
 class FundingProvider:
     """Aggregates and interprets funding data for a given project."""
 
@@ -20,25 +37,40 @@ class FundingProvider:
         self.cache = CacheProvider()
         self.serpapi_key = os.getenv("SERPAPI_KEY")
 
+    async def init_cache(self):
+        """Ensure cache connection is established."""
+        await self.cache.connect()
+
+    async def close(self):
+        """Release the cache connection."""
+        await self.cache.close()
+
     async def get_funding_info(self, project_name: str, funding_urls: list[str]) -> Dict[str, Any]:
         """Main orchestration method for funding discovery and synthesis."""
         cache_key = f"funding:{project_name.lower()}"
         cached = await self.cache.get(cache_key)
         if cached:
             logger.info(f"♻️ Using cached funding info for {project_name}")
-            return json.loads(cached)
+            return cached
 
         logger.info(f"💰 Aggregating funding info for {project_name}")
 
-        # 1️⃣ Gather raw data from all sources
-        defillama_data = await self._try_defillama(project_name)
-        coingecko_data = await self._try_coingecko(project_name)
-        serpapi_data = await self._try_serpapi(project_name) if self.serpapi_key else None
+        # 1️⃣ Gather raw data from all sources concurrently (different hosts,
+        # nothing shared — latency is max-of-three instead of sum)
+        async def _skip():
+            return None
+
+        defillama_data, coingecko_data, serpapi_data = await asyncio.gather(
+            self._try_defillama(project_name),
+            self._try_coingecko(project_name),
+            self._try_serpapi(project_name) if self.serpapi_key else _skip(),
+            return_exceptions=True,
+        )
 
         raw_sources = {
-            "defillama": defillama_data,
-            "coingecko": coingecko_data,
-            "serpapi": serpapi_data,
+            "defillama": defillama_data if not isinstance(defillama_data, Exception) else None,
+            "coingecko": coingecko_data if not isinstance(coingecko_data, Exception) else None,
+            "serpapi": serpapi_data if not isinstance(serpapi_data, Exception) else None,
         }
 
         # Filter out None
@@ -54,8 +86,8 @@ class FundingProvider:
             "funding_details": summary,
         }
 
-        # 3️⃣ Cache for 24 hours
-        await self.cache.set(cache_key, json.dumps(result), ttl=86400)
+        # 3️⃣ Cache for 24 hours (CacheProvider handles serialization)
+        await self.cache.set(cache_key, result, ttl=86400)
         logger.info(f"✅ Funding aggregation complete for {project_name}")
 
         return result
@@ -69,31 +101,71 @@ class FundingProvider:
         cache_key = "defillama:protocols"
         cached = await self.cache.get(cache_key)
         if cached:
-            try:
-                return json.loads(cached)
-            except Exception:
-                pass  # ignore malformed cache
+            protocols = cached.get("value") if isinstance(cached, dict) else cached
+            if isinstance(protocols, list):
+                return protocols
 
         url = f"{DEFILLAMA_URL}/protocols"
         try:
-            async with httpx.AsyncClient(timeout=15) as client:
-                resp = await client.get(url)
-                if resp.status_code == 200:
-                    protocols = resp.json()
-                    await self.cache.set(cache_key, json.dumps(protocols), ttl=86400)
-                    logger.info(f"📥 Cached {len(protocols)} DeFiLlama protocols list")
-                    return protocols
+            client = get_client()
+            if ijson is not None:
+                # Stream-parse the ~1MB array so decoding overlaps the
+                # network receive instead of waiting for the full body
+                protocols = []
+
+                @ijson.coroutine
+                def _collect():
+                    while True:
+                        protocols.append((yield))
+
+                parser = ijson.items_coro(_collect(), "item")
+                async with client.stream("GET", url, timeout=15) as resp:
+                    if resp.status_code != 200:
+                        return []
+                    async for chunk in resp.aiter_bytes():
+                        parser.send(chunk)
+                parser.close()
+            else:
+                resp = await client.get(url, timeout=15)
+                if resp.status_code != 200:
+                    return []
+                protocols = fast_json(resp)
+
+            await self.cache.set(cache_key, protocols, ttl=86400)
+            logger.info(f"📥 Cached {len(protocols)} DeFiLlama protocols list")
+            return protocols
         except Exception as e:
             logger.warning(f"⚠️ Failed to fetch DeFiLlama protocols list: {e}")
 
         return []  # fallback empty list
 
+    async def _get_protocol_index(self):
+        """Return (by_name, by_slug, protocols), building the index once per day."""
+        global _protocols_index
+
+        index = _protocols_index
+        if index and (time.time() - index[0]) < _PROTOCOLS_INDEX_TTL:
+            return index[1], index[2], index[3]
+
+        async with _protocols_lock:
+            # Re-check: another task may have rebuilt while we waited
+            index = _protocols_index
+            if index and (time.time() - index[0]) < _PROTOCOLS_INDEX_TTL:
+                return index[1], index[2], index[3]
+
+            protocols = await self._get_defillama_protocols()
+            by_name = {str(p.get("name", "")).lower(): p for p in protocols if p.get("name")}
+            by_slug = {str(p.get("slug", "")).lower(): p for p in protocols if p.get("slug")}
+            _protocols_index = (time.time(), by_name, by_slug, protocols)
+            return by_name, by_slug, protocols
+
 
+    @cached_json("defillama:lookup", ttl=86400)
     async def _try_defillama(self, project_name: str) -> Optional[Dict[str, Any]]:
         """Fetch funding info from DeFiLlama API with fuzzy slug matching."""
         try:
             project_key = project_name.lower().strip()
-            protocols = await self._get_defillama_protocols()
+            by_name, by_slug, protocols = await self._get_protocol_index()
 
             if not protocols:
                 logger.warning("⚠️ Empty DeFiLlama protocols list — skipping")
@@ -101,15 +173,17 @@ class FundingProvider:
 
             logger.debug(f"🔍 Searching {len(protocols)} DeFiLlama protocols for '{project_key}'")
 
-            # Safe fuzzy match
-            match = next(
-                (
-                    p for p in protocols
-                    if project_key in str(p.get("name", "")).lower()
-                    or project_key in str(p.get("slug", "")).lower()
-                ),
-                None,
-            )
+            # Exact name/slug hit is O(1); substring scan only on miss
+            match = by_name.get(project_key) or by_slug.get(project_key)
+            if not match:
+                match = next(
+                    (
+                        p for p in protocols
+                        if project_key in str(p.get("name", "")).lower()
+                        or project_key in str(p.get("slug", "")).lower()
+                    ),
+                    None,
+                )
 
             if not match:
                 logger.info(f"⚠️ No DeFiLlama slug match found for {project_name}")
@@ -121,27 +195,27 @@ class FundingProvider:
                 return None
 
             url = f"{DEFILLAMA_URL}/protocol/{slug}"
-            async with httpx.AsyncClient(timeout=httpx.Timeout(30.0, connect=10.0)) as client:
-                resp = await client.get(url)
-                logger.info(f"🌐 DeFiLlama lookup for {url} → {resp.status_code}")
+            async with _LLAMA_SEM:
+                resp = await get_client().get(url, timeout=httpx.Timeout(30.0, connect=10.0))
+            logger.info(f"🌐 DeFiLlama lookup for {url} → {resp.status_code}")
 
-                if resp.status_code != 200:
-                    logger.warning(f"⚠️ DeFiLlama returned {resp.status_code} for {slug}")
-                    return None
-
-                data = resp.json()
-                logger.info(f"✅ Fetched DeFiLlama data for {data.get('name', slug)}")
-
-                return {
-                    "source": "defillama",
-                    "name": data.get("name"),
-                    "slug": data.get("slug"),
-                    "category": data.get("category"),
-                    "chains": data.get("chains"),
-                    "mcap": data.get("mcap"),
-                    "funding": data.get("funding", {}),
-                    "url": url,
-                }
+            if resp.status_code != 200:
+                logger.warning(f"⚠️ DeFiLlama returned {resp.status_code} for {slug}")
+                return None
+
+            data = fast_json(resp)
+            logger.info(f"✅ Fetched DeFiLlama data for {data.get('name', slug)}")
+
+            return {
+                "source": "defillama",
+                "name": data.get("name"),
+                "slug": data.get("slug"),
+                "category": data.get("category"),
+                "chains": data.get("chains"),
+                "mcap": data.get("mcap"),
+                "funding": data.get("funding", {}),
+                "url": url,
+            }
 
         except Exception as e:
             import traceback
@@ -150,51 +224,63 @@ class FundingProvider:
 
 
 
+    @cached_json("coingecko:coin-id", ttl=600)
+    async def _cg_coin_id(self, query: str) -> Optional[str]:
+        """Resolve a search query to the top CoinGecko coin id (10-min cache)."""
+        resp = await get_client().get(f"{COINGECKO_URL}/search?query={query}", timeout=10)
+        if resp.status_code != 200:
+            return None
+        results = fast_json(resp).get("coins", [])
+        return results[0]["id"] if results else None
+
+    @cached_json("coingecko:detail", ttl=600)
+    async def _cg_coin_detail(self, coin_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch the full coin detail document (10-min cache)."""
+        resp = await get_client().get(f"{COINGECKO_URL}/coins/{coin_id}", timeout=10)
+        if resp.status_code != 200:
+            return None
+        return fast_json(resp)
+
+    @cached_json("coingecko:funding", ttl=3600)
     async def _try_coingecko(self, project_name: str) -> Optional[Dict[str, Any]]:
         """Fetch funding/market info from CoinGecko API (trimmed version)."""
         try:
-            search_url = f"{COINGECKO_URL}/search?query={project_name}"
-            async with httpx.AsyncClient(timeout=10) as client:
-                search_resp = await client.get(search_url)
-                if search_resp.status_code != 200:
-                    return None
-
-                results = search_resp.json().get("coins", [])
-                if not results:
-                    return None
-
-                coin_id = results[0]["id"]
-                detail_url = f"{COINGECKO_URL}/coins/{coin_id}"
-                detail_resp = await client.get(detail_url)
-                if detail_resp.status_code != 200:
-                    return None
-
-                detail = detail_resp.json()
-
-                market_data = detail.get("market_data", {})
-                return {
-                    "source": "coingecko",
-                    "id": coin_id,
-                    "symbol": detail.get("symbol"),
-                    "name": detail.get("name"),
-                    "description": (detail.get("description", {}) or {}).get("en", "")[:400],
-                    "market": {
-                        "current_price_usd": market_data.get("current_price", {}).get("usd"),
-                        "market_cap_usd": market_data.get("market_cap", {}).get("usd"),
-                        "total_volume_usd": market_data.get("total_volume", {}).get("usd"),
-                        "price_change_24h": market_data.get("price_change_percentage_24h"),
-                    },
-                    "links": {
-                        "homepage": (detail.get("links", {}).get("homepage") or [None])[0],
-                        "twitter": detail.get("links", {}).get("twitter_screen_name"),
-                        "repos": detail.get("links", {}).get("repos_url", {}).get("github", []),
-                    },
-                }
+            # Search and detail are cached separately, so other lookups that
+            # resolve to the same coin skip the search hop entirely —
+            # CoinGecko rate-limits aggressively.
+            coin_id = await self._cg_coin_id(project_name)
+            if not coin_id:
+                return None
+
+            detail = await self._cg_coin_detail(coin_id)
+            if not detail:
+                return None
+
+            market_data = detail.get("market_data", {})
+            return {
+                "source": "coingecko",
+                "id": coin_id,
+                "symbol": detail.get("symbol"),
+                "name": detail.get("name"),
+                "description": (detail.get("description", {}) or {}).get("en", "")[:400],
+                "market": {
+                    "current_price_usd": market_data.get("current_price", {}).get("usd"),
+                    "market_cap_usd": market_data.get("market_cap", {}).get("usd"),
+                    "total_volume_usd": market_data.get("total_volume", {}).get("usd"),
+                    "price_change_24h": market_data.get("price_change_percentage_24h"),
+                },
+                "links": {
+                    "homepage": (detail.get("links", {}).get("homepage") or [None])[0],
+                    "twitter": detail.get("links", {}).get("twitter_screen_name"),
+                    "repos": detail.get("links", {}).get("repos_url", {}).get("github", []),
+                },
+            }
         except Exception as e:
             logger.warning(f"⚠️ CoinGecko lookup failed for {project_name}: {e}")
             return None
 
 
+    @cached_json("serpapi:funding", ttl=3600)
     async def _try_serpapi(self, project_name: str) -> Optional[Dict[str, Any]]:
         """Fallback search using SerpAPI for funding announcements."""
         try:
@@ -204,19 +290,18 @@ class FundingProvider:
                 "q": f"{project_name} funding site:crunchbase.com OR site:techcrunch.com OR site:cointelegraph.com",
                 "api_key": self.serpapi_key,
             }
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.get(url, params=params)
-                if resp.status_code != 200:
-                    return None
-                data = resp.json()
-                results = data.get("organic_results", [])
-                return {
-                    "source": "serpapi",
-                    "results": [
-                        {"title": r.get("title"), "link": r.get("link"), "snippet": r.get("snippet")}
-                        for r in results[:5]
-                    ],
-                }
+            resp = await get_client().get(url, params=params, timeout=10)
+            if resp.status_code != 200:
+                return None
+            data = fast_json(resp)
+            results = data.get("organic_results", [])
+            return {
+                "source": "serpapi",
+                "results": [
+                    {"title": r.get("title"), "link": r.get("link"), "snippet": r.get("snippet")}
+                    for r in results[:5]
+                ],
+            }
         except Exception as e:
             logger.warning(f"⚠️ SerpAPI lookup failed for {project_name}: {e}")
             return None
\ No newline at end of file
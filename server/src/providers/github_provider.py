@@ -1,12 +1,71 @@
 import os
+import re
+import time
 import asyncio
 import logging
-from github import Github  # type: ignore
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 from .cache_provider import CacheProvider
+from .http_client import fast_json, get_client
 
 logger = logging.getLogger(__name__)
 
+GITHUB_API = os.getenv("GITHUB_API_URL", "https://api.github.com")
+
+# Pulls the last page number out of a Link: ...&page=N>; rel="last" header
+_LAST_PAGE_RE = re.compile(r'[?&]page=(\d+)>; rel="last"')
+
+# README infrastructure scan: lowercase needle -> canonical label, matched
+# in one linear regex pass (longest-first so "github actions" wins over
+# any shorter overlapping needle) instead of a substring probe per tool
+_README_KEYWORDS = {
+    "docker": "Docker",
+    "kubernetes": "Kubernetes",
+    "terraform": "Terraform",
+    "aws": "AWS",
+    "ipfs": "IPFS",
+    "github actions": "GitHub Actions",
+    "prometheus": "Prometheus",
+    "ansible": "Ansible",
+    "puppet": "Puppet",
+    "chef": "Chef",
+    "openshift": "OpenShift",
+    "helm": "Helm",
+    "nomad": "Nomad",
+    "circleci": "CircleCI",
+    "jenkins": "Jenkins",
+    "grafana": "Grafana",
+    "s3": "AWS",
+    "pinata": "IPFS",
+}
+_README_KW_RE = re.compile(
+    "|".join(re.escape(k) for k in sorted(_README_KEYWORDS, key=len, reverse=True))
+)
+
+# Root tree + README in one GraphQL POST instead of two REST round-trips
+# (topics already arrive with the /repos payload). The REST readme
+# endpoint this replaced resolved any README spelling, so the query asks
+# for the common variants explicitly — aliases are checked in order.
+_README_ALIASES = (
+    "readmeUpper", "readmeLower", "readmeMixed",
+    "readmeRst", "readmeMarkdown", "readmePlain", "readmeTxt",
+)
+_INFRA_QUERY = """
+query($o: String!, $n: String!) {
+  repository(owner: $o, name: $n) {
+    object(expression: "HEAD:") { ... on Tree { entries { name } } }
+    readmeUpper: object(expression: "HEAD:README.md") { ... on Blob { text } }
+    readmeLower: object(expression: "HEAD:readme.md") { ... on Blob { text } }
+    readmeMixed: object(expression: "HEAD:Readme.md") { ... on Blob { text } }
+    readmeRst: object(expression: "HEAD:README.rst") { ... on Blob { text } }
+    readmeMarkdown: object(expression: "HEAD:README.markdown") { ... on Blob { text } }
+    readmePlain: object(expression: "HEAD:README") { ... on Blob { text } }
+    readmeTxt: object(expression: "HEAD:README.txt") { ... on Blob { text } }
+  }
+}
+"""
+
+
 class GitHubProvider:
     """GitHub API Provider with caching, async concurrency, and rate limit handling."""
 
@@ -15,15 +74,30 @@ class GitHubProvider:
         if not self.token:
             raise ValueError("GITHUB_TOKEN is not configured.")
 
-        self.client = Github(self.token)
+        # Plain REST over the shared pooled AsyncClient — every sub-fetch is
+        # a real coroutine on the event loop instead of a blocked thread.
+        self.headers = {
+            "Authorization": f"Bearer {self.token}",
+            "Accept": "application/vnd.github+json",
+        }
         self.cache = CacheProvider()
         self.cache_ttl = cache_ttl
+        # Caps concurrent GitHub requests per batch; bursts past ~8 trip
+        # the secondary rate limit and 403 the whole gather
+        self._sem = asyncio.Semaphore(int(os.getenv("GH_CONCURRENCY", "8")))
+        # Single-flight map: concurrent callers asking for the same cold
+        # repo share one fetch instead of each hitting GitHub
+        self._inflight: Dict[str, asyncio.Future] = {}
         logger.info("✅ GitHubProvider initialized successfully")
 
     async def init_cache(self):
         """Ensure cache connection is established."""
         await self.cache.connect()
 
+    async def close(self):
+        """Release the cache connection."""
+        await self.cache.close()
+
     # ─────────────────────────────
     # Utility
     # ─────────────────────────────
@@ -35,30 +109,102 @@ class GitHubProvider:
             return parts[0], parts[1]
         return parts[0], None
 
+    async def _api_get(self, path: str, **params):
+        """GET a GitHub REST endpoint, backing off on rate-limit responses."""
+        backoff = 1.0
+        for attempt in range(3):
+            r = await get_client().get(
+                f"{GITHUB_API}{path}", headers=self.headers, params=params or None, timeout=20
+            )
+            if r.status_code in (403, 429) and attempt < 2:
+                retry_after = r.headers.get("retry-after")
+                if retry_after:
+                    # Secondary limit: GitHub says exactly how long to wait
+                    delay = min(float(retry_after), 60.0)
+                elif r.headers.get("x-ratelimit-remaining") == "0":
+                    reset = float(r.headers.get("x-ratelimit-reset", "0"))
+                    delay = min(max(reset - time.time(), backoff), 60.0)
+                else:
+                    r.raise_for_status()
+                logger.warning("⏳ GitHub rate limited on %s; retrying in %.1fs", path, delay)
+                await asyncio.sleep(delay)
+                backoff *= 2
+                continue
+            r.raise_for_status()
+            return r
+        r.raise_for_status()
+        return r
+
+    async def _graphql(self, query: str, variables: dict) -> Dict[str, Any]:
+        """POST a GraphQL query, raising on transport or query errors."""
+        r = await get_client().post(
+            f"{GITHUB_API}/graphql",
+            headers=self.headers,
+            json={"query": query, "variables": variables},
+            timeout=20,
+        )
+        r.raise_for_status()
+        body = fast_json(r)
+        if body.get("errors"):
+            raise RuntimeError(f"GraphQL error: {body['errors']}")
+        return body.get("data") or {}
+
+    def _adaptive_ttl(self, data: Dict[str, Any]) -> int:
+        """TTL scaled to repo activity: 10% of time since last commit,
+        clamped to [1h, 7d]. Active repos refresh often; dormant ones
+        stop burning API quota on no-op refreshes."""
+        try:
+            date_str = (data.get("activity", {}).get("last_commit") or {}).get("date")
+            last_ts = datetime.fromisoformat(date_str.replace("Z", "+00:00")).timestamp()
+            return min(7 * 24 * 3600, max(3600, int((time.time() - last_ts) * 0.1)))
+        except Exception:
+            return self.cache_ttl
+
+    @staticmethod
+    def _last_page(response) -> Optional[int]:
+        """Total page count from the Link header (None if single page)."""
+        match = _LAST_PAGE_RE.search(response.headers.get("link", ""))
+        return int(match.group(1)) if match else None
+
     # ─────────────────────────────
     # Repo Sub-fetchers
     # ─────────────────────────────
-    async def _get_activity_metrics(self, owner: str, repo: str) -> Dict[str, Any]:
-        """Get repository activity metrics"""
+    async def _get_activity_metrics(self, owner: str, repo: str, repo_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Get repository activity metrics (repo_data is the /repos payload)"""
         try:
-            repo_obj = await asyncio.to_thread(self.client.get_repo, f"{owner}/{repo}")
-
-            def _metrics():
-                commits = list(repo_obj.get_commits()[:100])
-                contributors_count = repo_obj.get_contributors().totalCount
-                return {
-                    "total_commits": repo_obj.get_commits().totalCount,
-                    "recent_commits_count": len(commits),
-                    "contributors": contributors_count,
-                    "open_issues": repo_obj.open_issues_count,
-                    "last_commit": {
-                        "date": commits[0].commit.author.date.isoformat() if commits else None,
-                        "message": commits[0].commit.message if commits else None,
-                        "author": commits[0].commit.author.name if commits else None,
-                    },
-                }
-
-            return await asyncio.to_thread(_metrics)
+            # Recent commits and the contributor count (Link rel=last page
+            # number at per_page=1) are independent — fetch them together
+            commits_resp, contrib_resp = await asyncio.gather(
+                self._api_get(f"/repos/{owner}/{repo}/commits", per_page=100),
+                self._api_get(f"/repos/{owner}/{repo}/contributors", per_page=1, anon="true"),
+            )
+            commits = fast_json(commits_resp)
+
+            if self._last_page(commits_resp) is None:
+                # No Link header: the page we already have is the whole
+                # history, so the total costs nothing extra
+                total_commits = len(commits)
+            else:
+                # per_page=1 makes the Link "last" page number equal the
+                # commit count — no pagination walk
+                total_resp = await self._api_get(f"/repos/{owner}/{repo}/commits", per_page=1)
+                total_commits = self._last_page(total_resp) or len(fast_json(total_resp))
+
+            contributors = self._last_page(contrib_resp) or len(fast_json(contrib_resp))
+
+            head = (commits[0].get("commit") or {}) if commits else {}
+            author = head.get("author") or {}
+            return {
+                "total_commits": total_commits,
+                "recent_commits_count": len(commits),
+                "contributors": contributors,
+                "open_issues": repo_data.get("open_issues_count"),
+                "last_commit": {
+                    "date": author.get("date"),
+                    "message": head.get("message"),
+                    "author": author.get("name"),
+                },
+            }
         except Exception as e:
             logger.error(f"Error getting activity metrics for {owner}/{repo}: {e}")
             return {"error": str(e)}
@@ -66,22 +212,20 @@ class GitHubProvider:
     async def _get_languages(self, owner: str, repo: str) -> Dict[str, int]:
         """Get language breakdown"""
         try:
-            repo_obj = await asyncio.to_thread(self.client.get_repo, f"{owner}/{repo}")
-            return await asyncio.to_thread(repo_obj.get_languages)
+            return fast_json(await self._api_get(f"/repos/{owner}/{repo}/languages"))
         except Exception as e:
             logger.error(f"Error fetching languages for {owner}/{repo}: {e}")
             return {}
-    
-    async def _detect_infrastructure(self, owner: str, repo: str) -> list[str]:
+
+    async def _detect_infrastructure(self, owner: str, repo: str, repo_data: Dict[str, Any]) -> list[str]:
         """
         Detect infrastructure tools by scanning repo files and topics.
         Looks for Docker, Kubernetes, Terraform, AWS, IPFS, etc.
+        repo_data is the already-fetched /repos payload.
         """
         try:
-            repo_obj = await asyncio.to_thread(self.client.get_repo, f"{owner}/{repo}")
-
             # ─── Detect from topics ────────────────────────
-            topics = repo_obj.get_topics()
+            topics = repo_data.get("topics") or []
             infra_tools = set()
 
             topic_text = " ".join(topics).lower()
@@ -96,9 +240,22 @@ class GitHubProvider:
             if "ipfs" in topic_text:
                 infra_tools.add("IPFS")
 
-            # ─── Detect from repo files ────────────────────
-            contents = await asyncio.to_thread(repo_obj.get_contents, "")
-            filenames = [c.name.lower() for c in contents]
+            # Well-tagged repos can skip the tree/README fetch entirely:
+            # topics can only ever yield these five labels, so once all are
+            # present the remote scan adds nothing topics could confirm.
+            # Opt-in since the README may still reveal CI/monitoring tools.
+            if (
+                os.getenv("INFRA_SKIP_README_IF_TAGGED")
+                and {"Docker", "Kubernetes", "Terraform", "AWS", "IPFS"}.issubset(infra_tools)
+            ):
+                return sorted(infra_tools)
+
+            # ─── Detect from repo files (one GraphQL POST for the root
+            # tree and the README together) ─────────────────
+            data = await self._graphql(_INFRA_QUERY, {"o": owner, "n": repo})
+            repository = data.get("repository") or {}
+            entries = (repository.get("object") or {}).get("entries") or []
+            filenames = [e["name"].lower() for e in entries if e.get("name")]
 
             if "dockerfile" in filenames or any("docker-compose" in f for f in filenames):
                 infra_tools.add("Docker")
@@ -112,29 +269,12 @@ class GitHubProvider:
                 infra_tools.add("IPFS")
 
             # ─── Detect from README (for keywords) ─────────
-            try:
-                readme = await asyncio.to_thread(repo_obj.get_readme)
-                readme_text = readme.decoded_content.decode("utf-8").lower()
-                for keyword, label in [
-                    ("docker", "Docker"),
-                    ("kubernetes", "Kubernetes"),
-                    ("terraform", "Terraform"),
-                    ("aws", "AWS"),
-                    ("ipfs", "IPFS"),
-                    ("GitHub Actions", "CircleCI", "Jenkins", "jenkins"),
-                    ("Prometheus", "Grafana", "prometheus", "grafana"),
-                    ("Ansible", "ansible"),
-                    ("Puppet", "puppet"),
-                    ("Chef", "chef"),
-                    ("OpenShift", "openshift"),
-                    ("Helm", "helm"),
-                    ("Nomad", "nomad"),
-                    ("S3", "Pinata", "s3", "pinata"),
-                ]:
-                    if keyword in readme_text:
-                        infra_tools.add(label)
-            except Exception:
-                pass  # README not found, ignore
+            readme = next(
+                (repository[a] for a in _README_ALIASES if repository.get(a)), {}
+            )
+            readme_text = (readme.get("text") or "").lower()
+            for match in _README_KW_RE.finditer(readme_text):
+                infra_tools.add(_README_KEYWORDS[match.group(0)])
 
             return sorted(list(infra_tools))
 
@@ -142,16 +282,14 @@ class GitHubProvider:
             logger.error(f"Error detecting infrastructure for {owner}/{repo}: {e}")
             return []
 
-
-    def check_rate_limit(self) -> Dict[str, Any]:
+    async def check_rate_limit(self) -> Dict[str, Any]:
         """Check GitHub API rate limit"""
         try:
-            rate_limit = self.client.get_rate_limit()
-            core = rate_limit.core
+            core = fast_json(await self._api_get("/rate_limit")).get("resources", {}).get("core", {})
             return {
-                "remaining": core.remaining,
-                "limit": core.limit,
-                "reset": core.reset.isoformat(),
+                "remaining": core.get("remaining"),
+                "limit": core.get("limit"),
+                "reset": core.get("reset"),
             }
         except Exception as e:
             logger.error(f"Error checking rate limit: {e}")
@@ -171,46 +309,86 @@ class GitHubProvider:
 
         logger.info(f"🔍 Fetching GitHub stats for {len(github_urls)} repo(s).")
 
-        repos_data = []
-        total_stars, total_commits = 0, 0
+        pending_writes: Dict[str, tuple] = {}
 
         async def fetch_repo(owner: str, repo: str):
             cache_key = f"github:{owner}:{repo}"
+            # CacheProvider fronts Redis with an in-process LRU (60s TTL),
+            # so a repo touched twice in quick succession never re-pays the
+            # Redis round-trip or the msgpack decode
             cached = None if force_refresh else await self.cache.get(cache_key)
 
             if cached:
                 logger.info(f"💾 Cache hit for {owner}/{repo}")
                 return cached
 
+            existing = self._inflight.get(cache_key)
+            if existing is not None:
+                logger.info(f"🔗 Joining in-flight fetch for {owner}/{repo}")
+                return await existing
+
+            fut: asyncio.Future = asyncio.get_running_loop().create_future()
+            self._inflight[cache_key] = fut
             try:
-                repo_obj = await asyncio.to_thread(self.client.get_repo, f"{owner}/{repo}")
-                logger.info(f"✅ Fetched {owner}/{repo} from GitHub API")
-
-                activity = await self._get_activity_metrics(owner, repo)
-                languages = await self._get_languages(owner, repo)
-                infrastructure = await self._detect_infrastructure(owner, repo)
-
-                data = {
-                    "name": repo,
-                    "owner": owner,
-                    "stars": repo_obj.stargazers_count,
-                    "forks": repo_obj.forks_count,
-                    "watchers": repo_obj.watchers_count,
-                    "open_issues": repo_obj.open_issues_count,
-                    "language": repo_obj.language,
-                    "topics": repo_obj.get_topics(),
-                    "activity": activity,
-                    "languages": languages,
-                    "infrastructure": infrastructure,
-                    "source": "github-api",
-                }
-
-                await self.cache.set(cache_key, data, ttl=self.cache_ttl)
-                return data
-
-            except Exception as e:
-                logger.error(f"❌ Error fetching repo {owner}/{repo}: {e}")
-                return None
+                result = await _fetch_uncached(owner, repo, cache_key)
+                fut.set_result(result)
+                return result
+            finally:
+                self._inflight.pop(cache_key, None)
+                if not fut.done():
+                    fut.cancel()
+
+        async def _fetch_uncached(owner: str, repo: str, cache_key: str):
+            async with self._sem:
+                try:
+                    repo_data = fast_json(await self._api_get(f"/repos/{owner}/{repo}"))
+                    logger.info(f"✅ Fetched {owner}/{repo} from GitHub API")
+
+                    # The /repos payload is fetched once and handed down; the
+                    # three sub-fetches are independent I/O, so latency is
+                    # max-of-three instead of sum-of-three
+                    activity, languages, infrastructure = await asyncio.gather(
+                        self._get_activity_metrics(owner, repo, repo_data),
+                        self._get_languages(owner, repo),
+                        self._detect_infrastructure(owner, repo, repo_data),
+                        return_exceptions=True,
+                    )
+                    if isinstance(activity, BaseException):
+                        activity = {"error": str(activity)}
+                    if isinstance(languages, BaseException):
+                        languages = {}
+                    if isinstance(infrastructure, BaseException):
+                        infrastructure = []
+
+                    data = {
+                        "name": repo,
+                        "owner": owner,
+                        "stars": repo_data.get("stargazers_count"),
+                        "forks": repo_data.get("forks_count"),
+                        "watchers": repo_data.get("watchers_count"),
+                        "open_issues": repo_data.get("open_issues_count"),
+                        "language": repo_data.get("language"),
+                        "topics": repo_data.get("topics") or [],
+                        "activity": activity,
+                        "languages": languages,
+                        "infrastructure": infrastructure,
+                        "source": "github-api",
+                    }
+
+                    # Queue the write; the whole batch lands in one pipeline.
+                    # A long-lived stale copy rides along so an upstream
+                    # outage can still serve yesterday's numbers.
+                    pending_writes[cache_key] = (data, self._adaptive_ttl(data))
+                    pending_writes[f"github:stale:{owner}:{repo}"] = (data, 7 * 24 * 3600)
+                    return data
+
+                except Exception as e:
+                    logger.error(f"❌ Error fetching repo {owner}/{repo}: {e}")
+                    stale = await self.cache.get(f"github:stale:{owner}:{repo}")
+                    if stale:
+                        logger.warning(f"♻️ Serving stale cached stats for {owner}/{repo}")
+                        return {**stale, "stale": True}
+                    return None
 
         # Run all requests concurrently
         tasks = []
@@ -223,13 +401,17 @@ class GitHubProvider:
 
         results = await asyncio.gather(*tasks, return_exceptions=True)
 
+        if pending_writes:
+            await self.cache.mset_with_ttl(pending_writes)
+
         # Aggregate results
-        for data in results:
-            if not data or isinstance(data, Exception):
-                continue
-            repos_data.append(data)
-            total_stars += data.get("stars", 0)
-            total_commits += data.get("activity", {}).get("total_commits", 0)
+        repos_data = [d for d in results if d and not isinstance(d, Exception)]
+        total_stars = sum(d.get("stars") or 0 for d in repos_data)
+        total_commits = sum(
+            d["activity"].get("total_commits") or 0
+            for d in repos_data
+            if isinstance(d.get("activity"), dict)
+        )
 
         final_stats = {
             "total_stars": total_stars,
@@ -237,6 +419,15 @@ class GitHubProvider:
             "repos": repos_data,
         }
 
+        # Summary only at INFO; the full payload is DEBUG-gated so the big
+        # dict is never stringified on production log levels
+        logger.info(
+            "📊 Aggregated GitHub stats: %d repos, %d stars, %d commits",
+            len(repos_data), total_stars, total_commits,
+        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("GitHub stats payload=%s", final_stats)
+
         return final_stats
 
     # ─────────────────────────────
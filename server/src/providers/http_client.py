@@ -0,0 +1,57 @@
+import logging
+import httpx # type: ignore
+import orjson # type: ignore
+
+logger = logging.getLogger(__name__)
+
+
+def fast_json(response: httpx.Response):
+    """Parse a response body with orjson (2-5x faster than resp.json())."""
+    return orjson.loads(response.content)
+
+# Single process-wide AsyncClient so every outbound call reuses pooled
+# keep-alive connections instead of paying TCP + TLS setup per request.
+_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=50, keepalive_expiry=30.0
+)
+_TIMEOUT = httpx.Timeout(15.0, connect=5.0)
+
+# Explicit negotiation keeps the large JSON payloads (DeFiLlama's
+# /protocols especially) compressed on the wire; brotli comes from the
+# `brotli` package, and httpx decodes transparently.
+_HEADERS = {"Accept-Encoding": "gzip, br", "Accept": "application/json"}
+
+_client: httpx.AsyncClient | None = None
+
+
+async def _log_http_version(response: httpx.Response):
+    # Lets us confirm HTTP/2 multiplexing is actually negotiated per host
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s %s via %s", response.request.method, response.request.url, response.http_version)
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared AsyncClient, creating it lazily on first use.
+
+    HTTP/2 lets the repeated SerpAPI/Tavily calls multiplex as concurrent
+    streams on one TLS session instead of queuing on keep-alive sockets.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            http2=True,
+            http1=True,
+            timeout=_TIMEOUT,
+            limits=_LIMITS,
+            headers=_HEADERS,
+            event_hooks={"response": [_log_http_version]},
+        )
+    return _client
+
+
+async def close_client():
+    """Close the shared client (call once on app shutdown)."""
+    global _client
+    if _client is not None and not _client.is_closed:
+        await _client.aclose()
+        _client = None
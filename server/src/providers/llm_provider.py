@@ -1,11 +1,31 @@
 import os
+import re
 import httpx # pyright: ignore[reportMissingImports]
 import logging
 import json
+import orjson # type: ignore
+from typing import AsyncIterator
+
+from src.providers.http_client import get_client
 
 logger = logging.getLogger(__name__)
 
 
+def _pretty(obj) -> str:
+    """Indent-2 JSON for prompts via orjson (C-speed, tight separators)."""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2, default=str).decode()
+
+# Compiled once — detect_funding_clues and the total_funding
+# normalization run these per analyzed project
+_ROUND_RE = re.compile(r"(Series\s+[A-Z])", re.I)
+_AMOUNT_RE = re.compile(r"\$[0-9]+(?:\.[0-9]+)?\s*(?:M|million|B|billion)?", re.I)
+_INVESTOR_RE = re.compile(
+    r"\b(Sequoia|Paradigm|a16z|Binance\s+Labs|Coinbase\s+Ventures|Andreessen\s+Horowitz|Polychain|Dragonfly|Pantera)\b",
+    re.I,
+)
+_FUNDING_NORM_RE = re.compile(r"\$?(\d+(?:\.\d+)?)([MBmb]?)")
+
+
 class LLMProvider:
     """LLM provider using Fireworks.ai to generate project insights."""
 
@@ -14,14 +34,14 @@ class LLMProvider:
         self.base_url = os.getenv("LLM_BASE_URL", "https://api.fireworks.ai/inference/v1/completions")
         self.model = os.getenv("LLM_MODEL", "accounts/fireworks/models/llama-v3p1-70b-instruct")
 
-    async def generate_insight(self, project_name, github, twitter, funding):
-        """Generate a full insight summary (non-streamed) for a project."""
+    async def stream_insight(self, project_name, github, twitter, funding) -> AsyncIterator[str]:
+        """Yield insight text chunks as the model produces them (SSE stream)."""
         prompt = f"""
         Generate an honest, analytical summary of the crypto project '{project_name}'
         using this data:
-        GitHub: {json.dumps(github, indent=2)}
-        Twitter: {json.dumps(twitter, indent=2)}
-        Funding: {json.dumps(funding, indent=2)}
+        GitHub: {_pretty(github)}
+        Twitter: {_pretty(twitter)}
+        Funding: {_pretty(funding)}
 
         The summary should be written in markdown with sections for:
         - Overview
@@ -42,14 +62,33 @@ class LLMProvider:
             "prompt": prompt,
             "max_tokens": 700,
             "temperature": 0.7,
-            "stream": False
+            "stream": True
         }
 
-        async with httpx.AsyncClient(timeout=httpx.Timeout(60.0)) as client:
-            resp = await client.post(self.base_url, headers=headers, json=payload)
+        # Shared pooled client: completions can take a while, so only the
+        # timeout is overridden per-request
+        async with get_client().stream(
+            "POST", self.base_url, headers=headers, json=payload, timeout=httpx.Timeout(60.0)
+        ) as resp:
             resp.raise_for_status()
-            data = resp.json()
-            return data.get("choices", [{}])[0].get("text", "No insight generated.")
+            async for line in resp.aiter_lines():
+                if not line.startswith("data:"):
+                    continue
+                chunk = line[5:].strip()
+                if chunk == "[DONE]":
+                    break
+                try:
+                    event = orjson.loads(chunk)
+                except orjson.JSONDecodeError:
+                    continue
+                text = event.get("choices", [{}])[0].get("text")
+                if text:
+                    yield text
+
+    async def generate_insight(self, project_name, github, twitter, funding):
+        """Generate a full insight summary for a project (collected stream)."""
+        parts = [chunk async for chunk in self.stream_insight(project_name, github, twitter, funding)]
+        return "".join(parts) or "No insight generated."
 
     async def extract_funding_details(self, project_name: str, raw_sources: dict) -> dict:
         """
@@ -59,8 +98,6 @@ class LLMProvider:
         - Guides LLM to produce confident, structured JSON output
         """
 
-        import re
-
         if not raw_sources:
             return {"error": "No funding data available"}
 
@@ -76,18 +113,15 @@ class LLMProvider:
 
         # Regex-based funding clue extraction\
         def detect_funding_clues(snippets: str):
-            rounds = re.findall(r"(Series\s+[A-Z])", snippets, re.I)
-            amounts = re.findall(r"\$[0-9]+(?:\.[0-9]+)?\s*(?:M|million|B|billion)?", snippets, re.I)
-            investors = [
-                m.group(0) for m in re.finditer(
-                    r"\b(Sequoia|Paradigm|a16z|Binance\s+Labs|Coinbase\s+Ventures|Andreessen\s+Horowitz|Polychain|Dragonfly|Pantera)\b",
-                    snippets, re.I
-                )
-            ]
+            rounds = _ROUND_RE.findall(snippets)
+            amounts = _AMOUNT_RE.findall(snippets)
+            investors = [m.group(0) for m in _INVESTOR_RE.finditer(snippets)]
+            # Sorted sets keep identical inputs producing identical
+            # prompts, which downstream caches can actually hit
             return {
-                "rounds": list(set(rounds)),
-                "amounts": list(set(amounts)),
-                "investors": list(set(investors)),
+                "rounds": sorted(set(rounds)),
+                "amounts": sorted(set(amounts)),
+                "investors": sorted(set(investors)),
             }
 
         funding_hints = detect_funding_clues(text_snippets)
@@ -103,13 +137,13 @@ class LLMProvider:
         - SerpAPI (funding news and investor details)
 
         ## Hints (from regex pre-scan)
-        {json.dumps(funding_hints, indent=2)}
+        {_pretty(funding_hints)}
 
         ## Textual funding snippets
         {text_snippets}
 
         ## Full structured data
-        {json.dumps(raw_sources, indent=2)}
+        {_pretty(raw_sources)}
 
         Analyze this data carefully and return only valid JSON with this structure:
 
@@ -142,56 +176,66 @@ class LLMProvider:
         }
 
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.post(self.base_url, headers=headers, json=payload)
-                resp.raise_for_status()
-                data = resp.json()
-                text_output = data.get("choices", [{}])[0].get("text", "")
+            resp = await get_client().post(
+                self.base_url, headers=headers, json=payload, timeout=httpx.Timeout(60.0)
+            )
+            resp.raise_for_status()
+            data = resp.json()
+            text_output = data.get("choices", [{}])[0].get("text", "")
 
-                # Step 1: Try direct JSON parse
+            # Step 1: Try a direct orjson parse, skipping the attempt
+            # outright when the output clearly isn't bare JSON
+            stripped = text_output.strip()
+            parsed = None
+            if stripped and (stripped[0] in "{[" or "{" in stripped[:32]):
                 try:
-                    result = json.loads(text_output)
+                    result = orjson.loads(stripped)
                     if isinstance(result, dict):
                         parsed = result
-                    else:
-                        raise ValueError
-                except Exception:
-                    # Step 2: Clean up malformed JSON
-                    cleaned = text_output.strip()
-                    cleaned = cleaned.split("```")[-1]
-                    cleaned = cleaned.replace("```json", "").replace("```", "").strip()
-                    cleaned = cleaned.replace("\n", " ").replace("\r", " ")
+                except orjson.JSONDecodeError:
+                    pass
+
+            if parsed is None:
+                # Step 2: Clean up malformed JSON (code fences, newlines)
+                cleaned = stripped.split("```")[-1]
+                cleaned = cleaned.replace("```json", "").replace("```", "").strip()
+                cleaned = cleaned.replace("\n", " ").replace("\r", " ")
+                try:
+                    parsed = orjson.loads(cleaned)
+                except orjson.JSONDecodeError:
+                    # orjson is stricter than models sometimes are — give
+                    # stdlib json the final word
                     try:
                         parsed = json.loads(cleaned)
                     except json.JSONDecodeError:
                         logger.warning(f"⚠️ JSON parse failed for {project_name}")
                         parsed = None
 
-                # Step 3: Fallback if no valid parse
-                if not parsed:
-                    return {
-                        "project": project_name,
-                        "summary": "Could not extract valid funding details.",
-                        "details": {
-                            "total_funding": None,
-                            "last_round": None,
-                            "investors": [],
-                            "notable_backers": [],
-                            "funding_sources": list(raw_sources.keys())
-                        }
+            # Step 3: Fallback if no valid parse
+            if not parsed:
+                return {
+                    "project": project_name,
+                    "summary": "Could not extract valid funding details.",
+                    "details": {
+                        "total_funding": None,
+                        "last_round": None,
+                        "investors": [],
+                        "notable_backers": [],
+                        "funding_sources": list(raw_sources.keys())
                     }
+                }
 
-                # Step 4: Normalize numeric field (optional)
-                details = parsed.get("details", {})
-                if isinstance(details.get("total_funding"), str):
-                    match = re.match(r"\$?(\d+(?:\.\d+)?)([MBmb]?)", details["total_funding"])
-                    if match:
-                        num, unit = match.groups()
-                        multiplier = 1_000_000 if unit.lower() == "m" else 1_000_000_000 if unit.lower() == "b" else 1
-                        details["total_funding_usd"] = float(num) * multiplier
-                        parsed["details"] = details
-
-                return parsed
+            # Step 4: Normalize numeric field (optional)
+            details = parsed.get("details", {})
+            if isinstance(details.get("total_funding"), str):
+                match = _FUNDING_NORM_RE.match(details["total_funding"])
+                if match:
+                    num, unit = match.groups()
+                    multiplier = 1_000_000 if unit.lower() == "m" else 1_000_000_000 if unit.lower() == "b" else 1
+                    details["total_funding_usd"] = float(num) * multiplier
+                    parsed["details"] = details
+
+            return parsed
 
         except Exception as e:
             logger.error(f"❌ Enhanced LLM funding extraction failed for {project_name}: {e}")
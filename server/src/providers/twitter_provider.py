@@ -1,11 +1,14 @@
 import os
 import httpx # type: ignore
+import orjson # type: ignore
 import logging
 import asyncio
 import random
 import time
+from email.utils import parsedate_to_datetime
 from urllib.parse import urlparse
 from .cache_provider import CacheProvider
+from .http_client import fast_json, get_client
 import re
 
 logger = logging.getLogger(__name__)
@@ -17,35 +20,195 @@ TAVILY_API_URL = os.getenv("TAVILY_BASE_URL", "https://api.tavily.com/search")
 DUCKDUCKGO_API_URL = os.getenv("DUCKDUCKGO_API_URL", "https://duckduckgo.com/html/")
 TWITTER_USER_FIELDS = "description,public_metrics,profile_image_url"
 
+# One compiled pass picks up every count in snippets like
+# "182.2K Followers · 300 Following · 12K Posts". Inputs here are a few
+# hundred bytes, so a single re pass is already sub-microsecond — not
+# worth a DFA-engine dependency.
+METRIC_RE = re.compile(r"([\d,.]+[KkMm]?)\s*(Followers|Following|Tweets|Posts)", re.IGNORECASE)
+_METRIC_KEY = {"followers": "followers", "following": "following", "tweets": "tweets", "posts": "tweets"}
+
+# Handle straight out of a profile URL without a full urlparse; handles are
+# 1-15 chars of [A-Za-z0-9_] on either domain, with an optional leading @
+_URL_RE = re.compile(
+    r"^https?://(?:www\.)?(?:x|twitter)\.com/@?([A-Za-z0-9_]{1,15})", re.IGNORECASE
+)
+
+
+# Bytes pattern: the DuckDuckGo page is only scanned for one link shape,
+# so matching resp.content directly skips decoding the whole HTML body
+_DDG_RE = re.compile(rb"https://x\.com/([A-Za-z0-9_]+)")
+
+
+# Server-side failure accounting: HINCRBY + timestamp + TTL run as one
+# atomic step, so concurrent workers can't lose increments to the old
+# read-modify-write race on the attempts key
+_RECORD_FAILURE_LUA = """
+local attempts = redis.call('HINCRBY', KEYS[1], 'attempts', 1)
+redis.call('HSET', KEYS[1], 'last_attempt', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return attempts
+"""
+
+
+def _username_from_url(url: str) -> str:
+    """Extract the handle from a twitter.com/x.com URL (urlparse fallback)."""
+    match = _URL_RE.match(url)
+    if match:
+        return match.group(1)
+    return urlparse(url).path.strip("/")
+
+
+class AdaptiveTokenBucket:
+    """Per-host request pacer with an AIMD-adjusted refill rate.
+
+    Successes nudge the rate up additively; a 429/5xx halves it, so the
+    provider converges on whatever pace the host actually tolerates
+    instead of slamming into its limit and burning retries.
+    """
+
+    def __init__(self, rate=5.0, capacity=10.0, min_rate=0.5, max_rate=20.0):
+        self.rate = rate                  # tokens refilled per second
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = capacity
+        self._last_refill = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    async def acquire(self):
+        """Take one token, sleeping until the refill covers the deficit.
+
+        Loop rather than sleep-once: concurrent waiters wake together, and
+        only callers that find a whole token may decrement — the rest
+        recompute the deficit and go back to sleep.
+        """
+        self._refill()
+        while self.tokens < 1:
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+            self._refill()
+        self.tokens -= 1
+
+    def on_success(self):
+        self.rate = min(self.max_rate, self.rate + 0.1)
+
+    def on_failure(self):
+        self.rate = max(self.min_rate, self.rate / 2)
+
 
 class TwitterProvider:
     """Fetch Twitter profile data with caching, retry, fallback, and auto-refresh."""
 
-    def __init__(self, refresh_threshold=0.9, max_fetch_attempts=3, cooldown_seconds=3600):
+    def __init__(self, refresh_threshold=0.9, max_fetch_attempts=3, cooldown_seconds=3600,
+                 max_concurrency=int(os.getenv("TWITTER_CONCURRENCY", "8"))):
         self.cache = CacheProvider()
         self.twitter_bearer = os.getenv("TWITTER_BEARER_TOKEN")
+        # Built once — only the username in the URL varies per call. The
+        # shared client already sends Accept/Accept-Encoding defaults.
+        self._twitter_headers = {"Authorization": f"Bearer {self.twitter_bearer}"}
+        self._twitter_params = {"user.fields": TWITTER_USER_FIELDS}
         self.serp_api_key = os.getenv("SERPAPI_KEY")
+        self._tavily_key = os.getenv("TAVILY_API_KEY")
+        # Constant part of the Tavily request, copied-and-extended per call
+        self._tavily_payload = {"api_key": self._tavily_key, "max_results": 5}
         self.timeout = 20.0
         self.refresh_threshold = refresh_threshold  
         self.max_fetch_attempts = max_fetch_attempts
         self.cooldown_seconds = cooldown_seconds
+        # Bounds the per-batch fan-out so a long URL list can't stampede
+        # the Twitter API or the search fallbacks
+        self._sem = asyncio.Semaphore(max_concurrency)
+        # One pacer per upstream host (api.x.com, serpapi.com, …), created lazily
+        self._buckets = {}
+        # Near-expiry refreshes are queued for one background worker instead
+        # of spawning a task per cache hit; _refresh_seen dedupes handles
+        # already waiting so a hot profile is refreshed once per cycle
+        self._refresh_queue = asyncio.Queue(maxsize=100)
+        self._refresh_seen = set()
+        self._refresh_worker_task = None
+        # Failure accounting: Lua script once Redis is up, local dict otherwise
+        self._record_failure_script = None
+        self._local_attempts = {}
+        # In-flight live fetches by username, so concurrent callers share one
+        self._inflight = {}
+        # Fallback chain resolved once at construction: backends missing
+        # their credentials never enter the per-username dispatch at all,
+        # and the entries are pre-bound methods — the dispatch loop does
+        # no attribute lookups or guard checks per username
+        self._chain = tuple(
+            fetch for fetch, configured in (
+                (self._fetch_twitter_profile, bool(self.twitter_bearer)),
+                (self._fetch_via_tavily, bool(self._tavily_key)),
+                (self._fetch_via_serpapi, bool(self.serp_api_key)),
+                (self._fetch_via_duckduckgo, True),
+            ) if configured
+        )
 
     async def initialize(self):
-        """Ensure cache provider is connected to Redis."""
+        """Connect the cache provider and start the background refresh worker."""
         await self.cache.connect()
+        self._record_failure_script = self.cache.register_script(_RECORD_FAILURE_LUA)
+        if self._refresh_worker_task is None:
+            self._refresh_worker_task = asyncio.create_task(self._refresh_worker())
+
+    def _queue_refresh(self, username: str):
+        """Enqueue a near-expiry refresh, deduped and bounded (drops on overflow)."""
+        # Lazy start covers callers that never ran initialize(): the queue
+        # must not fill up with nothing draining it
+        if self._refresh_worker_task is None:
+            self._refresh_worker_task = asyncio.create_task(self._refresh_worker())
+        key = username.lower()
+        if key in self._refresh_seen:
+            return
+        try:
+            self._refresh_queue.put_nowait(username)
+            self._refresh_seen.add(key)
+        except asyncio.QueueFull:
+            logger.debug(f"Refresh queue full, skipping @{username}")
+
+    async def _refresh_worker(self):
+        """Drain queued refreshes one at a time in the background."""
+        while True:
+            username = await self._refresh_queue.get()
+            try:
+                await self._auto_refresh(username)
+            finally:
+                self._refresh_seen.discard(username.lower())
+                self._refresh_queue.task_done()
+
+    async def close(self):
+        """Stop the refresh worker and release the cache connection."""
+        if self._refresh_worker_task is not None:
+            self._refresh_worker_task.cancel()
+            self._refresh_worker_task = None
+        await self.cache.close()
 
     # ─────────────────────────────
     # Retry + rate limit guard
     # ─────────────────────────────
+    def _failure_script(self):
+        """Return the registered failure script, registering it on demand.
+
+        initialize() registers it eagerly; this covers provider instances
+        whose cache connected some other way, so the atomic path is used
+        whenever Redis is actually reachable.
+        """
+        if self._record_failure_script is None:
+            self._record_failure_script = self.cache.register_script(_RECORD_FAILURE_LUA)
+        return self._record_failure_script
+
     async def _should_refetch(self, username: str) -> bool:
         """Decide whether to allow a new fetch for this username."""
         key = f"twitter:fetch_attempts:{username.lower()}"
-        data = await self.cache.get(key)
-        if not data:
-            return True  # No prior failures
-
-        attempts = data.get("attempts", 0)
-        last_attempt = data.get("last_attempt", 0)
+        if self._failure_script() is not None:
+            raw_attempts, raw_last = await self.cache.hmget(key, "attempts", "last_attempt")
+            attempts = int(raw_attempts or 0)
+            last_attempt = float(raw_last or 0)
+        else:
+            attempts, last_attempt = self._local_attempts.get(key, (0, 0.0))
         now = time.time()
 
         if attempts >= self.max_fetch_attempts and (now - last_attempt) < self.cooldown_seconds:
@@ -55,33 +218,78 @@ class TwitterProvider:
         return True
 
     async def _record_failed_fetch(self, username: str):
-        """Increment failure count for a username."""
+        """Atomically increment failure count and drop the negative-cache tombstone."""
         key = f"twitter:fetch_attempts:{username.lower()}"
-        data = await self.cache.get(key) or {"attempts": 0, "last_attempt": 0}
-        data["attempts"] += 1
-        data["last_attempt"] = time.time()
-        await self.cache.set(key, data, ttl=self.cooldown_seconds)
+        now = time.time()
+        script = self._failure_script()
+        if script is not None:
+            # Server-side CAS: no lost updates when workers fail concurrently
+            await script(keys=[key], args=[now, self.cooldown_seconds])
+        else:
+            attempts, _ = self._local_attempts.get(key, (0, 0.0))
+            self._local_attempts[key] = (attempts + 1, now)
+        await self.cache.set(f"twitter:neg:{username.lower()}", {"failed_at": now}, ttl=900)
 
     async def _reset_fetch_attempts(self, username: str):
-        """Reset failure tracker after success."""
+        """Clear the failure tracker and tombstone after success (one pipeline)."""
         key = f"twitter:fetch_attempts:{username.lower()}"
-        await self.cache.set(key, {"attempts": 0, "last_attempt": time.time()}, ttl=self.cooldown_seconds)
+        self._local_attempts.pop(key, None)
+        await self.cache.mset_with_ttl(
+            {}, delete=(key, f"twitter:neg:{username.lower()}")
+        )
 
 
     # ─────────────────────────────
     # Internal utilities
     # ─────────────────────────────
-    async def _safe_get(self, client, url, headers=None, params=None, retries=1, base_delay=2):
-        """Retry GET with exponential backoff + jitter for 429/5xx"""
+    @staticmethod
+    def _retry_after_seconds(resp):
+        """Parse a Retry-After header (seconds or HTTP-date) into a delay."""
+        raw = resp.headers.get("Retry-After")
+        if not raw:
+            return None
+        try:
+            return max(0.0, float(raw))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+        except Exception:
+            return None
+
+    async def _safe_get(self, client, url, headers=None, params=None, retries=3,
+                        base_delay=2, max_delay=30):
+        """Retry GET for 429/5xx, honoring Retry-After when the server sends one.
+
+        Without a server hint, waits use full jitter — random in
+        [0, min(cap, base * 2^i)] — so parallel retries don't re-collide
+        on the same schedule.
+        """
+        host = urlparse(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = AdaptiveTokenBucket()
+
         for i in range(retries):
             try:
-                resp = await client.get(url, headers=headers, params=params)
+                await bucket.acquire()
+                resp = await client.get(url, headers=headers, params=params, timeout=self.timeout)
                 if resp.status_code in (200, 404):
+                    bucket.on_success()
                     return resp
 
                 if resp.status_code in (429,) or resp.status_code >= 500:
-                    wait = base_delay * (2 ** i) + random.uniform(0, 1)
-                    logger.warning(f"⚠️ {resp.status_code} from {url}, retrying in {wait:.1f}s…")
+                    bucket.on_failure()
+                    hinted = self._retry_after_seconds(resp)
+                    if hinted is not None:
+                        wait = min(hinted, max_delay)
+                        source = "Retry-After"
+                    else:
+                        wait = random.uniform(0, min(max_delay, base_delay * (2 ** i)))
+                        source = "jitter"
+                    logger.warning(
+                        f"⚠️ {resp.status_code} from {url}, retrying in {wait:.1f}s ({source})…"
+                    )
                     await asyncio.sleep(wait)
                     continue
 
@@ -106,34 +314,50 @@ class TwitterProvider:
         if isinstance(twitter_urls, str):
             twitter_urls = [twitter_urls]
 
-        results = []
         now = time.time()
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            for url in twitter_urls:
-                username = urlparse(url).path.strip("/")
-                if not username:
-                    continue
+        # Shared pooled client — no per-batch TCP/TLS setup
+        client = get_client()
+
+        # One batched cache read for the whole URL list instead of a
+        # GET+TTL round-trip per profile
+        usernames = [_username_from_url(u) for u in twitter_urls]
+        cache_keys = [f"twitter:{u.lower()}" for u in usernames if u]
+        cached_map = {} if force_refresh else await self.cache.mget(cache_keys)
 
-                cache_key = f"twitter:{username.lower()}"
-                cached = None if force_refresh else await self.cache.get(cache_key)
+        async def _one(username):
+            if not username:
+                return None
 
-                # ── Cache hit
-                if cached:
-                    results.append(cached)
-                    logger.info(f"💾 Cache hit for @{username}")
+            cache_key = f"twitter:{username.lower()}"
+            cached = cached_map.get(cache_key)
 
-                    # Auto-refresh if cache is nearing expiry (background task)
-                    expires_at = cached.get("_meta", {}).get("expires")
-                    if expires_at and now > expires_at * self.refresh_threshold:
-                        asyncio.create_task(self._auto_refresh(username))
-                    continue
+            # ── Cache hit
+            if cached:
+                logger.info(f"💾 Cache hit for @{username}")
 
-                # ── No cache, fetch live
+                # Auto-refresh if cache is nearing expiry (background task)
+                expires_at = cached.get("_meta", {}).get("expires")
+                if expires_at and now > expires_at * self.refresh_threshold:
+                    self._queue_refresh(username)
+                return cached
+
+            # ── No cache, fetch live (bounded fan-out)
+            async with self._sem:
                 data = await self._fetch_live_data(client, username)
-                if data:
-                    await self.cache.set(cache_key, data, ttl=6 * 3600)
-                    results.append(data)
+            if data:
+                await self.cache.set(cache_key, data, ttl=6 * 3600)
+            return data
+
+        # Profiles are independent — fetch them concurrently instead of
+        # paying each miss's full fallback-chain latency in sequence
+        fetched = await asyncio.gather(*(_one(u) for u in usernames), return_exceptions=True)
+        results = []
+        for url, item in zip(twitter_urls, fetched):
+            if isinstance(item, Exception):
+                logger.error(f"❌ Twitter fetch failed for {url}: {item}")
+            elif item:
+                results.append(item)
 
         if not results:
             logger.warning("⚠️ No Twitter data fetched.")
@@ -147,15 +371,14 @@ class TwitterProvider:
         username = username.strip("@")
         cache_key = f"twitter:{username.lower()}"
 
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            data = await self._fetch_live_data(client, username)
-            if data:
-                await self.cache.set(cache_key, data, ttl=6 * 3600)
-                logger.info(f"🔄 Cache manually refreshed for @{username}")
-                return data
+        data = await self._fetch_live_data(get_client(), username)
+        if data:
+            await self.cache.set(cache_key, data, ttl=6 * 3600)
+            logger.info(f"🔄 Cache manually refreshed for @{username}")
+            return data
 
-            logger.warning(f"⚠️ Could not refresh cache for @{username}")
-            return None
+        logger.warning(f"⚠️ Could not refresh cache for @{username}")
+        return None
 
     # ─────────────────────────────
     # Internal helpers
@@ -164,22 +387,17 @@ class TwitterProvider:
         """Background task to refresh near-expired cache entries."""
         try:
             logger.info(f"🕐 Auto-refreshing cache for @{username} …")
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                data = await self._fetch_live_data(client, username)
-                if data:
-                    await self.cache.set(f"twitter:{username.lower()}", data, ttl=6 * 3600)
-                    logger.info(f"✅ Auto-refresh completed for @{username}")
+            data = await self._fetch_live_data(get_client(), username)
+            if data:
+                await self.cache.set(f"twitter:{username.lower()}", data, ttl=6 * 3600)
+                logger.info(f"✅ Auto-refresh completed for @{username}")
         except Exception as e:
             logger.warning(f"⚠️ Auto-refresh failed for @{username}: {e}")
 
     @staticmethod
-    def _parse_metric(text: str, pattern: str):
-        """Extracts numeric-like text and normalizes (e.g., '182.2K' → 182200)."""
-        match = re.search(pattern, text, re.IGNORECASE)
-        if not match:
-            return None
-
-        raw = match.group(1).replace(",", "")
+    def _normalize_count(raw: str):
+        """Normalize numeric-like text (e.g., '182.2K' → 182200)."""
+        raw = raw.replace(",", "")
         multiplier = 1
         if raw.lower().endswith("k"):
             multiplier = 1_000
@@ -193,17 +411,53 @@ class TwitterProvider:
         except ValueError:
             return None
 
+    @classmethod
+    def _extract_metrics(cls, text: str) -> dict:
+        """Pull followers/following/tweets out of snippet text in one regex pass."""
+        metrics = {}
+        for match in METRIC_RE.finditer(text):
+            key = _METRIC_KEY[match.group(2).lower()]
+            if key not in metrics:
+                metrics[key] = cls._normalize_count(match.group(1))
+        return metrics
+
     async def _fetch_live_data(self, client, username):
-        """Try Twitter API, then fallbacks."""
+        """Try Twitter API, then fallbacks (one flight per username at a time)."""
+        key = username.lower()
+        pending = self._inflight.get(key)
+        if pending is not None:
+            # Someone is already fetching this profile — await their result
+            return await pending
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            data = await self._fetch_live_uncached(client, username)
+            if not fut.done():
+                fut.set_result(data)
+            return data
+        finally:
+            self._inflight.pop(key, None)
+            if not fut.done():
+                fut.cancel()
+
+    async def _fetch_live_uncached(self, client, username):
+        """Run the actual fetch chain: Twitter API, then fallbacks."""
         if not await self._should_refetch(username):
             return None
 
-        data = (
-            await self._fetch_twitter_profile(client, username)
-            or await self._fetch_via_tavily(client, username)
-            or await self._fetch_via_serpapi(client, username)
-            or await self._fetch_via_duckduckgo(client, username)
-        )
+        # Negative cache: a username the whole chain just failed on gets a
+        # 15-minute tombstone so repeat requests don't replay four upstreams
+        neg_key = f"twitter:neg:{username.lower()}"
+        if await self.cache.get(neg_key):
+            logger.info(f"🚫 Negative-cache hit for @{username}, skipping fetch.")
+            return None
+
+        data = None
+        for fetch in self._chain:
+            data = await fetch(client, username)
+            if data:
+                break
 
         if data:
             await self._reset_fetch_attempts(username)
@@ -220,17 +474,18 @@ class TwitterProvider:
             return None
 
         url = TWITTER_API_URL.format(username)
-        headers = {"Authorization": f"Bearer {self.twitter_bearer}"}
-        params = {"user.fields": TWITTER_USER_FIELDS}
-
-        resp = await self._safe_get(client, url, headers=headers, params=params)
+        resp = await self._safe_get(
+            client, url, headers=self._twitter_headers, params=self._twitter_params
+        )
         if not resp or resp.status_code != 200:
             logger.warning(f"⚠️ Twitter API failed for @{username} ({resp.status_code if resp else 'no resp'})")
             return None
 
         try:
-            data = resp.json().get("data", {})
-            metrics = data.get("public_metrics", {})
+            data = fast_json(resp).get("data")
+            if not data:
+                return None
+            metrics = data.get("public_metrics") or {}
             return {
                 "username": data.get("username"),
                 "bio": data.get("description"),
@@ -269,13 +524,18 @@ class TwitterProvider:
             logger.warning(f"⚠️ SerpAPI Google search failed for @{username}")
             return None
 
-        logger.warning(f"SERPAPI (google engine) raw response for @{username}: {resp.text[:400]}")
+        # Raw-body dump only when debugging — resp.content skips the text
+        # decode and the old WARNING spammed production logs per profile
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"SERPAPI (google engine) raw response for @{username}: {resp.content[:400]}")
 
         try:
-            data = resp.json()
-            snippet = next(
-                (r for r in data.get("organic_results", []) if "x.com/" in r.get("link", "")), None
-            )
+            data = fast_json(resp)
+            snippet = None
+            for r in data.get("organic_results", ()):
+                if "x.com/" in (r.get("link") or ""):
+                    snippet = r
+                    break
             if not snippet:
                 return None
 
@@ -293,44 +553,49 @@ class TwitterProvider:
 
     async def _fetch_via_tavily(self, client, username):
         """Fallback: Tavily search for Twitter/X profile data (with light metric parsing)."""
-        tavily_key = os.getenv("TAVILY_API_KEY")
-        if not tavily_key:
+        if not self._tavily_key:
             logger.debug("No TAVILY_API_KEY configured.")
             return None
 
         try:
             payload = {
-                "api_key": tavily_key,
+                **self._tavily_payload,
                 "query": f"Twitter profile @{username} site:x.com OR site:twitter.com",
-                "max_results": 5,
             }
-            resp = await client.post(TAVILY_API_URL, json=payload)
+            # orjson-serialized body skips httpx's stdlib-json encode path
+            resp = await client.post(
+                TAVILY_API_URL,
+                content=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"},
+                timeout=self.timeout,
+            )
             if resp.status_code != 200:
                 logger.warning(f"⚠️ Tavily fallback failed for @{username} ({resp.status_code})")
                 return None
 
-            data = resp.json()
-            result = next(
-                (r for r in data.get("results", []) if "x.com/" in r.get("url", "")), None
-            )
+            data = fast_json(resp)
+            # Plain scan with break: no generator frame, stops at first hit
+            result = None
+            for r in data.get("results", ()):
+                if "x.com/" in (r.get("url") or ""):
+                    result = r
+                    break
             if not result:
                 logger.info(f"ℹ️ Tavily returned no X.com results for @{username}")
                 return None
 
             content = result.get("content", "") or ""
 
-            # ── Try to extract numeric metrics from text like "182.2K Followers · 300 Following · 12K Posts"
-            followers = self._parse_metric(content, r"([\d,.KkMm]+)\s*Followers")
-            following = self._parse_metric(content, r"([\d,.KkMm]+)\s*Following")
-            tweets = self._parse_metric(content, r"([\d,.KkMm]+)\s*(Tweets|Posts)")
+            # ── One compiled pass over the snippet instead of three searches
+            metrics = self._extract_metrics(content)
 
             return {
                 "username": username,
                 "bio": content[:300],
                 "profile_url": result.get("url"),
-                "followers": followers,
-                "following": following,
-                "tweets": tweets,
+                "followers": metrics.get("followers"),
+                "following": metrics.get("following"),
+                "tweets": metrics.get("tweets"),
                 "source": "tavily",
             }
 
@@ -343,14 +608,13 @@ class TwitterProvider:
         """Last-resort fallback: DuckDuckGo HTML scrape (no key)."""
         try:
             q = f"site:twitter.com @{username}"
-            url = f"{DUCKDUCKGO_API_URL}?q={q}"
-            resp = await client.get(url)
+            # params= percent-encodes the query properly (the raw f-string
+            # left spaces and '@' unescaped)
+            resp = await client.get(DUCKDUCKGO_API_URL, params={"q": q}, timeout=self.timeout)
             if resp.status_code != 200:
                 return None
 
-            html = resp.text
-            import re
-            match = re.search(r"https://x\.com/([A-Za-z0-9_]+)", html)
+            match = _DDG_RE.search(resp.content)
             if not match:
                 return None
 